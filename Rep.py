@@ -1,15 +1,53 @@
 from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QProgressBar, QPushButton
-from PyQt6.QtGui import QFont, QPainter, QColor
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QPainter, QColor, QPixmap, QPdfWriter, QPageSize
+from PyQt6.QtCore import Qt, QSizeF, QMarginsF
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import multiprocessing
+import os
 import sys
 
+
+@lru_cache(maxsize=1024)
+def gauge_pixmap(deforestation_score, size=150):
+    """ Circular score gauge, drawn once per (score, size) and reused """
+    pixmap = QPixmap(size, size)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    center_x, center_y = size // 2, size // 2
+
+    radius = 60
+    start_angle = 90 * 16  # Qt uses 1/16th of a degree
+    span_angle = int(-360 * deforestation_score * 16)  # Full circle for max score
+
+    # Draw the background circle
+    painter.setBrush(QColor(230, 230, 230))
+    painter.drawEllipse(center_x - radius, center_y - radius, 2 * radius, 2 * radius)
+
+    # Draw the deforestation score indicator
+    painter.setBrush(QColor(255, 69, 0))  # Red for impact
+    painter.drawPie(center_x - radius, center_y - radius, 2 * radius, 2 * radius, start_angle, span_angle)
+
+    # Draw the center circle
+    painter.setBrush(QColor(255, 255, 255))
+    painter.drawEllipse(center_x - 20, center_y - 20, 40, 40)
+
+    # Draw text
+    painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+    painter.drawText(center_x - 20, center_y + 5, f"{deforestation_score:.2f}")
+    painter.end()
+    return pixmap
+
+
 class DeforestationAnalysis(QWidget):
-    def __init__(self, confidence, deforestation_score, Location, Date):
+    def __init__(self, confidence, deforestation_score, Location, Date, saved_to=None, interactive=True):
         super().__init__()
-        self.initUI(confidence, deforestation_score, Location, Date)
+        self.initUI(confidence, deforestation_score, Location, Date, saved_to, interactive)
 
 
-    def initUI(self , confidence , deforestation_score , Location , Date):
+    def initUI(self , confidence , deforestation_score , Location , Date, saved_to=None, interactive=True):
         self.setWindowTitle("Deforestation Analysis Report")
         self.setGeometry(200, 200, 400, 400)
 
@@ -37,6 +75,7 @@ class DeforestationAnalysis(QWidget):
         self.deforestation_score = deforestation_score # Example score
         self.gauge_label = QLabel(self)
         self.gauge_label.setFixedSize(150, 150)
+        self.gauge_label.setPixmap(gauge_pixmap(round(float(deforestation_score), 3)))
         layout.addWidget(self.gauge_label)
 
         # Location and Time
@@ -49,9 +88,10 @@ class DeforestationAnalysis(QWidget):
         layout.addWidget(date_label)
 
         # File Save Location
-        file_label = QLabel("📂 Results saved to: analysis_result_1741582220.txt")
-        file_label.setFont(QFont("Arial", 11))
-        layout.addWidget(file_label)
+        if saved_to:
+            file_label = QLabel(f"📂 Results saved to: {saved_to}")
+            file_label.setFont(QFont("Arial", 11))
+            layout.addWidget(file_label)
 
         # self.oxygenLevel = QLabel(f'Oxygen Level { confidence / 100 } ')
         # self.oxygenLevel.setFont(QFont("Arial" , 11))
@@ -68,40 +108,89 @@ class DeforestationAnalysis(QWidget):
         
 
 
-        # OK Button
-        btn = QPushButton("OK")
-        btn.clicked.connect(self.close)
-        layout.addWidget(btn)
+        # OK Button (left out of rendered reports)
+        if interactive:
+            btn = QPushButton("OK")
+            btn.clicked.connect(self.close)
+            layout.addWidget(btn)
 
         self.setLayout(layout)
 
-    def paintEvent(self, event):
-        """ Custom paint event for drawing a circular gauge """
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        rect = self.gauge_label.geometry()
-        center_x, center_y = rect.center().x(), rect.center().y()
-
-        radius = 60
-        start_angle = 90 * 16  # Qt uses 1/16th of a degree
-        span_angle = int(-360 * self.deforestation_score * 16)  # Full circle for max score
-
-        # Draw the background circle
-        painter.setBrush(QColor(230, 230, 230))
-        painter.drawEllipse(center_x - radius, center_y - radius, 2 * radius, 2 * radius)
-
-        # Draw the deforestation score indicator
-        painter.setBrush(QColor(255, 69, 0))  # Red for impact
-        painter.drawPie(center_x - radius, center_y - radius, 2 * radius, 2 * radius, start_angle, span_angle)
-
-        # Draw the center circle
-        painter.setBrush(QColor(255, 255, 255))
-        painter.drawEllipse(center_x - 20, center_y - 20, 40, 40)
+    def render_to_file(self, out_path):
+        """ Render the report without showing it; .pdf paths give a PDF, anything else an image """
+        self.layout().activate()
+        if out_path.lower().endswith(".pdf"):
+            writer = QPdfWriter(out_path)
+            writer.setResolution(96)  # One widget pixel per PDF pixel
+            # A page exactly the size of the widget (96 px = 72 pt)
+            writer.setPageSize(QPageSize(QSizeF(self.width() * 0.75, self.height() * 0.75), QPageSize.Unit.Point))
+            writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+            painter = QPainter()
+            if not painter.begin(writer):
+                return False
+            self.render(painter)
+            return painter.end()
+        return self.grab().save(out_path)
+
+
+# Offscreen batch rendering; each pool worker owns one hidden QApplication
+report_app = None
+
+
+def init_report_worker():
+    """ Process-pool initializer: start a QApplication on the offscreen platform """
+    global report_app
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    report_app = QApplication.instance() or QApplication([])
+
+
+def render_reports_chunk(jobs):
+    """ Render (report, out_path) pairs inside a worker; returns the paths written """
+    written = []
+    for report, out_path in jobs:
+        try:
+            widget = DeforestationAnalysis(
+                report["confidence"], report["deforestation_score"],
+                report["location"], report["date"],
+                saved_to=report.get("saved_to"), interactive=False
+            )
+            if widget.render_to_file(out_path):
+                written.append(out_path)
+            widget.deleteLater()
+        except Exception as e:
+            print(f"Error rendering report {out_path}: {str(e)}")
+    return written
+
+
+def render_reports(reports, out_dir, file_format="png", workers=None, chunk_size=50):
+    """
+    Render many reports to files in parallel, without showing any window
+
+    Args:
+        reports: dicts with confidence (0-1), deforestation_score (0-1), location, date
+                 and optionally name (file name stem) and saved_to
+        out_dir: Directory for the rendered files
+        file_format: "png", "jpg" or "pdf"
+        workers: Number of worker processes (defaults to the CPU count)
+
+    Returns:
+        list: Paths of the files written
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [
+        (report, os.path.join(out_dir, f"{report.get('name', f'report_{i:05d}')}.{file_format}"))
+        for i, report in enumerate(reports)
+    ]
+    chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+
+    written = []
+    # Forked children would inherit the parent's Qt state; spawned ones start clean
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_report_worker,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        for paths in executor.map(render_reports_chunk, chunks):
+            written.extend(paths)
+    return written
 
-        # Draw text
-        painter.setFont(QFont("Arial", 10, QFont.Weight.Bold))
-        painter.drawText(center_x - 20, center_y + 5, f"{self.deforestation_score:.2f}")
 
 # Run Application
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+import threading
+from sqlite_wal import open_wal_database
+
+
+class AlertMirror:
+    """
+    Local, indexed replica of the alerts stored on chain, kept in SQLite.
+
+    sync() pins its reads to the latest block and remembers both that block and the
+    alert count there. If no new block has been mined since the last sync, nothing is
+    read from the contract. Otherwise only alerts with ids past the stored count are
+    fetched. Queries by bounding box, time range and alert type never touch the node.
+
+    The chain object needs latest_block(), fetch_alert_count(block),
+    fetch_recent_alerts(block) and fetch_alert(alert_id, block), as EthereumBlockchain
+    provides.
+    """
+
+    def __init__(self, path, chain=None):
+        self.path = path
+        self.chain = chain
+        self.lock = threading.Lock()
+        self.db = open_wal_database(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY,
+                alert_type TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                latitude REAL,
+                longitude REAL,
+                deforestation INTEGER NOT NULL,
+                synced_block INTEGER NOT NULL
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS alerts_location ON alerts (latitude, longitude)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS alerts_time ON alerts (timestamp)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS alerts_type ON alerts (alert_type, timestamp)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value INTEGER)")
+
+    def state(self, key, default=None):
+        row = self.db.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def sync(self):
+        """Fetch alerts added since the last sync; returns how many were added"""
+        if self.chain is None:
+            return 0
+        with self.lock:
+            try:
+                block = self.chain.latest_block()
+                if block == self.state("synced_block"):
+                    return 0
+
+                synced_count = self.state("synced_count", 0)
+                count = self.chain.fetch_alert_count(block)
+                if count <= synced_count:
+                    self.save_state(block, synced_count)
+                    return 0
+
+                # One call usually covers everything new; fill any older gap id by id
+                new = {alert["id"]: alert for alert in self.chain.fetch_recent_alerts(block)
+                       if synced_count <= alert["id"] < count}
+                for alert_id in range(synced_count, count):
+                    if alert_id not in new:
+                        new[alert_id] = self.chain.fetch_alert(alert_id, block)
+
+                self.db.execute("BEGIN")
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO alerts "
+                    "(id, alert_type, timestamp, latitude, longitude, deforestation, synced_block) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [(alert["id"], alert["alertType"], int(alert["timestamp"]),
+                      to_float(alert["latitude"]), to_float(alert["longitude"]),
+                      int(bool(alert["deforestation"])), block)
+                     for alert in new.values()]
+                )
+                self.save_state(block, count, in_transaction=True)
+                self.db.execute("COMMIT")
+                return len(new)
+            except Exception as e:
+                if self.db.in_transaction:
+                    self.db.execute("ROLLBACK")
+                print(f"Error syncing alerts: {str(e)}")
+                return 0
+
+    def save_state(self, block, count, in_transaction=False):
+        if not in_transaction:
+            self.db.execute("BEGIN")
+        self.db.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                            [("synced_block", block), ("synced_count", count)])
+        if not in_transaction:
+            self.db.execute("COMMIT")
+
+    def query(self, bbox=None, start=None, end=None, alert_type=None, limit=None):
+        """
+        Alerts matching every given filter, newest first
+
+        Args:
+            bbox: (min_lat, min_lon, max_lat, max_lon)
+            start, end: Unix timestamps, inclusive
+            alert_type: e.g. "DEFORESTED"
+            limit: Maximum number of alerts to return
+
+        Returns:
+            list: dicts with id, alertType, timestamp, latitude, longitude, deforestation
+        """
+        clauses, params = [], []
+        if bbox is not None:
+            clauses.append("latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?")
+            params += [bbox[0], bbox[2], bbox[1], bbox[3]]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(int(start))
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(int(end))
+        if alert_type is not None:
+            clauses.append("alert_type = ?")
+            params.append(alert_type)
+
+        sql = "SELECT id, alert_type, timestamp, latitude, longitude, deforestation FROM alerts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [
+            {"id": row[0], "alertType": row[1], "timestamp": row[2],
+             "latitude": row[3], "longitude": row[4], "deforestation": bool(row[5])}
+            for row in rows
+        ]
+
+    def count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM alerts").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def to_float(value):
+    """Coordinates are stored on chain as strings; unparsable ones become NULL"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,229 @@
+import time
+import threading
+from functools import partial
+from sqlite_wal import open_wal_database
+from ethereum_integration import to_hex
+
+
+class AlertOutbox:
+    """
+    Durable outbox between analysis results and the chain, stored in SQLite (WAL mode).
+
+    Every alert is written to disk before anything is sent. Alerts for the same
+    location cell, time bucket and score share a dedupe key, so repeated analyses of
+    one view produce a single transaction. Failed deliveries are retried with
+    exponential backoff, and alerts left in flight by a crash are replayed on the
+    next start. Delivery runs on a background thread through
+    blockchain.submit_deforestation_alert once a blockchain is attached.
+    """
+
+    def __init__(self, path, blockchain=None, cell_precision=3, time_bucket=3600, score_precision=1,
+                 base_backoff=5.0, max_backoff=900.0, max_attempts=20, poll_interval=1.0):
+        self.path = path
+        self.cell_precision = cell_precision
+        self.time_bucket = time_bucket
+        self.score_precision = score_precision
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+
+        self.lock = threading.Lock()
+        self.callbacks = {}  # dedupe key -> callback; not persisted
+        self.db = open_wal_database(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                dedupe_key TEXT PRIMARY KEY,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                score REAL NOT NULL,
+                created_at REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                tx_hash TEXT,
+                block_number INTEGER,
+                last_error TEXT
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+
+        # Alerts that never reached the chain before a crash go straight back to pending;
+        # ones with a transaction hash are checked against the chain once it is attached
+        self.db.execute("UPDATE outbox SET status = 'pending' WHERE status = 'sending' AND tx_hash IS NULL")
+        self.recovered = False
+
+        self.blockchain = None
+        self.wake = threading.Event()
+        self.running = True
+        self.worker = threading.Thread(target=self.deliver_loop, daemon=True, name="alert-outbox")
+        self.worker.start()
+        if blockchain is not None:
+            self.attach(blockchain)
+
+    def attach(self, blockchain):
+        """Start delivering to this blockchain (it may connect after alerts were queued)"""
+        self.blockchain = blockchain
+        self.wake.set()
+
+    def dedupe_key(self, latitude, longitude, score, timestamp):
+        """Location cell, time bucket and quantized score"""
+        return (f"{round(float(latitude), self.cell_precision)}:"
+                f"{round(float(longitude), self.cell_precision)}:"
+                f"{int(timestamp // self.time_bucket)}:"
+                f"{round(float(score), self.score_precision)}")
+
+    def enqueue(self, latitude, longitude, score, timestamp=None, callback=None):
+        """
+        Persist an alert for delivery
+
+        Returns:
+            dict: {"status": "queued", "key": ...} or {"status": "duplicate", "key": ...}
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        key = self.dedupe_key(latitude, longitude, score, timestamp)
+        with self.lock:
+            inserted = self.db.execute(
+                "INSERT OR IGNORE INTO outbox (dedupe_key, latitude, longitude, score, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, float(latitude), float(longitude), float(score), timestamp)
+            ).rowcount
+            if inserted and callback is not None:
+                self.callbacks[key] = callback
+        self.wake.set()
+        return {"status": "queued" if inserted else "duplicate", "key": key}
+
+    def deliver_loop(self):
+        while self.running:
+            self.wake.wait(self.poll_interval)
+            self.wake.clear()
+            if self.blockchain is None:
+                continue
+            try:
+                if not self.recovered:
+                    self.recover_sent()
+                for row in self.claim_due():
+                    self.send(*row)
+            except Exception as e:
+                print(f"Error delivering alerts: {str(e)}")
+
+    def recover_sent(self):
+        """Resolve alerts whose transaction was sent just before a crash"""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT dedupe_key, tx_hash FROM outbox WHERE status = 'sending' AND tx_hash IS NOT NULL"
+            ).fetchall()
+        for key, tx_hash in rows:
+            receipt = self.blockchain.get_receipt(tx_hash)
+            if receipt is not None:
+                self.delivered(key, {"status": "success",
+                                     "transaction_hash": tx_hash,
+                                     "block_number": receipt["blockNumber"]})
+            else:
+                self.retry(key, "Transaction not found after restart")
+        self.recovered = True
+
+    def claim_due(self, limit=32):
+        """Mark up to limit due alerts as sending and return them"""
+        now = time.time()
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.db.execute(
+                    "SELECT dedupe_key, latitude, longitude, score, tx_hash FROM outbox "
+                    "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY created_at LIMIT ?",
+                    (now, limit)
+                ).fetchall()
+                # tx_hash is kept, so a retried alert can be checked against its earlier transaction
+                self.db.executemany("UPDATE outbox SET status = 'sending' WHERE dedupe_key = ?",
+                                    [(row[0],) for row in rows])
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+        return rows
+
+    def send(self, key, latitude, longitude, score, tx_hash=None):
+        try:
+            # An earlier attempt may have been mined after all; sending again would store it twice
+            if tx_hash is not None:
+                receipt = self.blockchain.get_receipt(tx_hash)
+                if receipt is not None:
+                    self.delivered(key, {"status": "success",
+                                         "transaction_hash": tx_hash,
+                                         "block_number": receipt["blockNumber"]})
+                    return
+            result = self.blockchain.submit_deforestation_alert(
+                latitude=latitude,
+                longitude=longitude,
+                deforestation_score=score,
+                callback=partial(self.delivered, key),
+                sent_callback=partial(self.record_tx_hash, key)
+            )
+        except Exception as e:
+            self.retry(key, str(e))
+            return
+
+        if result["status"] == "skipped":
+            self.finish(key, "skipped", result)
+
+    def record_tx_hash(self, key, tx_hash):
+        """Stored as 0x hex, the form get_receipt is later called with"""
+        tx_hash = to_hex(tx_hash)
+        with self.lock:
+            self.db.execute("UPDATE outbox SET tx_hash = ? WHERE dedupe_key = ?", (tx_hash, key))
+
+    def delivered(self, key, result):
+        """Submission queue callback: final receipt or error for one alert"""
+        if result["status"] == "success":
+            with self.lock:
+                self.db.execute(
+                    "UPDATE outbox SET tx_hash = ?, block_number = ? WHERE dedupe_key = ?",
+                    (result["transaction_hash"], result["block_number"], key)
+                )
+            self.finish(key, "sent", result)
+        else:
+            self.retry(key, result.get("message", "unknown error"))
+
+    def retry(self, key, message):
+        """Schedule another attempt with exponential backoff, or give up after max_attempts"""
+        with self.lock:
+            row = self.db.execute("SELECT attempts FROM outbox WHERE dedupe_key = ?", (key,)).fetchone()
+            if row is None:
+                return
+            attempts = row[0] + 1
+            if attempts < self.max_attempts:
+                delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+                self.db.execute(
+                    "UPDATE outbox SET status = 'pending', attempts = ?, next_attempt_at = ?, last_error = ? "
+                    "WHERE dedupe_key = ?",
+                    (attempts, time.time() + delay, message, key)
+                )
+                print(f"Alert delivery failed ({message}), retrying in {delay:.0f} s")
+                return
+        self.finish(key, "failed", {"status": "error", "message": message}, attempts=attempts)
+
+    def finish(self, key, status, result, attempts=None):
+        with self.lock:
+            if attempts is None:
+                self.db.execute("UPDATE outbox SET status = ? WHERE dedupe_key = ?", (status, key))
+            else:
+                self.db.execute("UPDATE outbox SET status = ?, attempts = ?, last_error = ? WHERE dedupe_key = ?",
+                                (status, attempts, result.get("message"), key))
+            callback = self.callbacks.pop(key, None)
+        if callback is not None:
+            try:
+                callback(result)
+            except Exception as e:
+                print(f"Error in outbox callback: {str(e)}")
+
+    def stats(self):
+        """Number of alerts in each status"""
+        with self.lock:
+            return dict(self.db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def close(self):
+        self.running = False
+        self.wake.set()
+        self.worker.join(timeout=2)
+        with self.lock:
+            self.db.close()
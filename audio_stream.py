@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import subprocess
+import numpy as np
+import soundfile as sf
+
+
+def video_content_hash(path, sample_bytes=4 * 1024 * 1024):
+    """
+    Hash identifying a video by its content rather than its name.
+
+    Reads the file size plus the first, middle and last sample_bytes, which is
+    enough to tell camera recordings apart without reading gigabytes of video.
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        for offset in (0, max(0, size // 2 - sample_bytes // 2), max(0, size - sample_bytes)):
+            f.seek(offset)
+            digest.update(f.read(sample_bytes))
+    return digest.hexdigest()[:32]
+
+
+def stream_audio(video_path, sample_rate=22050, channels=1, chunk_seconds=1.0):
+    """
+    Decode a video's audio track with ffmpeg and yield float32 PCM chunks as they arrive.
+
+    Audio is resampled by ffmpeg to the analyzers' native rate and channel count and
+    read from a pipe, so nothing is written to disk. Chunks have shape (frames, channels).
+    """
+    command = [
+        'ffmpeg',
+        '-v', 'error',
+        '-i', video_path,
+        '-vn',  # No video
+        '-f', 's16le',  # Raw 16-bit PCM
+        '-acodec', 'pcm_s16le',
+        '-ar', str(sample_rate),
+        '-ac', str(channels),
+        'pipe:1'
+    ]
+    chunk_bytes = int(sample_rate * chunk_seconds) * channels * 2
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    # Drain stderr on its own thread so a chatty ffmpeg cannot fill the pipe and stall stdout
+    errors = []
+    drain = threading.Thread(target=lambda: errors.append(process.stderr.read()), daemon=True)
+    drain.start()
+
+    finished = False
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            samples = np.frombuffer(data[:len(data) - len(data) % (2 * channels)], dtype=np.int16)
+            yield (samples.astype(np.float32) / 32768.0).reshape(-1, channels)
+        finished = True
+    finally:
+        # The consumer closed the generator early (or reading failed): stop ffmpeg quietly
+        if not finished:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+        drain.join()
+        process.stderr.close()
+
+    if returncode != 0:
+        stderr = b"".join(errors).decode(errors='replace')
+        raise RuntimeError(f"FFmpeg error: {stderr}")
+
+
+class AudioCache:
+    """On-disk cache of decoded audio and analysis features, keyed by video content hash"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(tempfile.gettempdir(), "forest_audio_cache")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def audio_path(self, key):
+        """WAV file for tools that need a path (same samples as the .npy)"""
+        return os.path.join(self.cache_dir, f"{key}.wav")
+
+    def load_audio(self, key):
+        """Memory-mapped (frames, channels) float32 samples, or None on a miss"""
+        path = os.path.join(self.cache_dir, f"{key}.npy")
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def store_audio(self, key, samples, sample_rate):
+        """
+        Persist decoded samples as .npy (for buffers) and .wav (for file-based analyzers).
+
+        Both files are written to temporary names and renamed into place, .npy last,
+        since load_audio treats the .npy existing as a complete entry.
+        """
+        wav_temp = self.audio_path(key) + ".tmp"
+        sf.write(wav_temp, samples, sample_rate, subtype='PCM_16', format='WAV')
+        os.replace(wav_temp, self.audio_path(key))
+
+        npy_path = os.path.join(self.cache_dir, f"{key}.npy")
+        with open(npy_path + ".tmp", 'wb') as f:
+            np.save(f, samples)
+        os.replace(npy_path + ".tmp", npy_path)
+
+    def load_features(self, key):
+        """Previously computed analysis features for this video, or None"""
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def store_features(self, key, features):
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        with open(path + ".tmp", 'w') as f:
+            json.dump(features, f)
+        os.replace(path + ".tmp", path)
+
+    def key_for_audio_path(self, audio_path):
+        """Cache key of an audio file that lives in this cache, else None"""
+        if os.path.dirname(os.path.abspath(audio_path)) != os.path.abspath(self.cache_dir):
+            return None
+        return os.path.splitext(os.path.basename(audio_path))[0]
+
+    def extract(self, video_path, sample_rate=22050, channels=1):
+        """Return (key, samples) for a video, streaming through ffmpeg only on a cache miss"""
+        key = f"{video_content_hash(video_path)}_{sample_rate}_{channels}"
+        samples = self.load_audio(key)
+        if samples is not None:
+            return key, samples
+
+        chunks = list(stream_audio(video_path, sample_rate, channels))
+        if chunks:
+            samples = np.concatenate(chunks, axis=0)
+        else:
+            samples = np.empty((0, channels), dtype=np.float32)
+        self.store_audio(key, samples, sample_rate)
+        return key, samples
@@ -0,0 +1,142 @@
+import os
+import ast
+import sys
+import subprocess
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import joblib
+
+# The analyzer this worker process loaded in init_worker
+analyzers = {}
+
+
+def load_script_analyzer(script_path):
+    """
+    Import an analysis script (e.g. deact.py) once and return analyze(samples, sample_rate, audio_path).
+
+    Scripts that define analyze(samples, sample_rate) are called in-process. Scripts
+    without one are command-line tools and are never imported, since their top-level
+    code would run the CLI; they, and any script that fails to import, are run as a
+    subprocess on the audio file instead.
+    """
+    def run_script(samples, sample_rate, audio_path):
+        result = subprocess.run([sys.executable, script_path, audio_path],
+                                capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            return {"error": result.stderr.strip() or f"exit code {result.returncode}"}
+        return {"output": result.stdout.strip()}
+
+    try:
+        with open(script_path, encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=script_path)
+        if not any(isinstance(node, ast.FunctionDef) and node.name == "analyze" for node in tree.body):
+            return run_script
+
+        spec = importlib.util.spec_from_file_location("audio_script_analyzer", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except BaseException as e:
+        # SystemExit from argparse counts too; the subprocess path still works
+        print(f"Could not import {script_path} ({e!r}), running it as a subprocess")
+        return run_script
+
+    def analyze(samples, sample_rate, audio_path):
+        return dict(module.analyze(samples, sample_rate))
+    return analyze
+
+
+def load_model_analyzer(model_path, features_path=None):
+    """
+    Load a pickled sound classifier once and return analyze(samples, sample_rate, audio_path).
+
+    The classifier is only meaningful on the features it was trained on, so they are
+    not guessed here: features_path (default: <model>_features.py next to the model)
+    must define extract_features(samples, sample_rate) -> (1, n_features) array, taken
+    from the model's training code. Without it, loading fails and every result for
+    this analyzer reports why.
+    """
+    if features_path is None:
+        features_path = os.path.splitext(model_path)[0] + "_features.py"
+    if not os.path.exists(features_path):
+        raise FileNotFoundError(
+            f"No feature extraction for {os.path.basename(model_path)}: expected "
+            f"extract_features(samples, sample_rate) from its training code in {features_path}"
+        )
+
+    spec = importlib.util.spec_from_file_location("audio_model_features", features_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    extract_features = module.extract_features
+    model = joblib.load(model_path)
+
+    def analyze(samples, sample_rate, audio_path):
+        features = extract_features(samples, sample_rate)
+
+        label = model.predict(features)[0]
+        result = {"label": label.item() if hasattr(label, "item") else label}
+        if hasattr(model, "predict_proba"):
+            result["confidence"] = float(np.max(model.predict_proba(features)[0]) * 100)
+        return result
+    return analyze
+
+
+# Result name -> loader; each runs in its own worker process
+ANALYZER_LOADERS = {
+    "deact_results": load_script_analyzer,
+    "bird_results": load_model_analyzer,
+}
+
+
+def init_worker(name, *loader_args):
+    """Process-pool initializer: load this worker's one audio model, exactly once"""
+    try:
+        analyzers[name] = ANALYZER_LOADERS[name](*loader_args)
+    except Exception as e:
+        analyzers[name] = str(e)
+
+
+def run_analyzer(name, samples, sample_rate, audio_path):
+    """Run one named analyzer inside a worker and return a structured result"""
+    analyzer = analyzers.get(name)
+    if analyzer is None or isinstance(analyzer, str):
+        return {"error": f"Analyzer not loaded: {analyzer}"}
+    try:
+        return analyzer(samples, sample_rate, audio_path)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+class AudioAnalyzerPool:
+    """Long-lived worker processes that keep the audio models loaded between files"""
+
+    def __init__(self, deact_script_path, bird_model_path, bird_features_path=None):
+        # One single-process executor per analyzer: each model is loaded once, in one
+        # process, and the analyzers still run concurrently
+        loader_args = {
+            "deact_results": (deact_script_path,),
+            "bird_results": (bird_model_path, bird_features_path),
+        }
+        self.executors = {
+            name: ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(name, *args))
+            for name, args in loader_args.items()
+        }
+
+    def analyze(self, samples, sample_rate, audio_path=None):
+        """Run the deact and bird analyzers concurrently on an in-memory buffer"""
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        futures = {
+            name: executor.submit(run_analyzer, name, samples, sample_rate, audio_path)
+            for name, executor in self.executors.items()
+        }
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                results[name] = {"error": str(e)}
+        return results
+
+    def shutdown(self):
+        for executor in self.executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,237 @@
+import sys
+import time
+import argparse
+import numpy as np
+
+
+class NullEvidenceBuffer:
+    """Evidence buffer that keeps and writes nothing, so disk I/O stays out of the timings"""
+
+    def add(self, frame, results):
+        pass
+
+    def save(self, frame, timestamp, prefix="evidence"):
+        return None
+
+    def close(self):
+        pass
+
+
+def benchmark_batched_inference(model_path, batch_sizes=(1, 4, 8, 16), frames=64):
+    """Measure VideoProcessingThread analysis throughput for several batch sizes"""
+    from deforest1 import VideoProcessingThread
+
+    thread = VideoProcessingThread("", model_path)
+    thread.evidence.close()
+    thread.evidence = NullEvidenceBuffer()
+    thread.load_poaching_model()
+    if thread.poaching_model is None:
+        print(f"Could not load model from {model_path}")
+        return {}
+
+    rng = np.random.default_rng(0)
+    sample = [rng.integers(0, 256, (720, 1280, 3), dtype=np.uint8) for _ in range(frames)]
+
+    # Warm up so graph building is not counted against batch size 1
+    thread.process_batch([(sample[0], time.time(), None)])
+
+    results = {}
+    for batch_size in batch_sizes:
+        start = time.perf_counter()
+        for i in range(0, frames, batch_size):
+            thread.process_batch([(frame, time.time(), None) for frame in sample[i:i + batch_size]])
+        elapsed = time.perf_counter() - start
+        results[batch_size] = frames / elapsed
+        print(f"Batch size {batch_size:>3}: {results[batch_size]:.2f} frames/s")
+
+    return results
+
+
+def benchmark_preprocessing(iterations=500, batch_size=1):
+    """Compare extract_image_features with the buffer-reusing FramePreprocessor"""
+    import tracemalloc
+    from deforest1 import VideoProcessingThread
+    from frame_preprocessing import FramePreprocessor
+
+    thread = VideoProcessingThread("", "")
+    preprocessor = FramePreprocessor(max_batch=batch_size)
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, (batch_size, 720, 1280, 3), dtype=np.uint8)
+
+    def current():
+        return np.concatenate([thread.extract_image_features(frame) for frame in frames], axis=0)
+
+    def reused():
+        return preprocessor.process(frames)
+
+    results = {}
+    for name, fn in (("extract_image_features", current), ("FramePreprocessor", reused)):
+        fn()  # Warm up, lets the preprocessor allocate its buffers
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+
+        # Peak transient heap (NumPy buffers are traced) during steady-state calls
+        tracemalloc.start()
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(10):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated = peak - baseline
+
+        results[name] = {"ms_per_call": 1000 * elapsed / iterations, "peak_allocated_bytes": allocated}
+        print(f"{name:>24}: {results[name]['ms_per_call']:.3f} ms/call, "
+              f"peak {allocated} bytes allocated per call")
+
+    return results
+
+
+def benchmark_history_lookup(point_counts=(1, 1000, 1000000), repeats=5):
+    """Compare per-point get_deforestation_data with the vectorized batch lookup"""
+    import tempfile
+    from com import get_deforestation_data, get_deforestation_batch
+    from history_grid import HistoryGrid
+
+    rng = np.random.default_rng(0)
+    results = {}
+    with tempfile.TemporaryDirectory() as grid_dir:
+        # India-sized grid at 0.05 degrees, ten years
+        grid = HistoryGrid(grid_dir)
+        loss = rng.uniform(0, 40, (640, 600, 10)).astype(np.float32)
+        grid.build(loss, origin=(6.0, 68.0), cell_size=0.05, first_year=2015)
+
+        for count in point_counts:
+            latitudes = rng.uniform(6.0, 38.0, count)
+            longitudes = rng.uniform(68.0, 98.0, count)
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                get_deforestation_batch(latitudes, longitudes, grid=grid)
+            batch = (time.perf_counter() - start) / repeats
+
+            # Per-point lookups are timed on at most 10k points and scaled up
+            sample = min(count, 10000)
+            start = time.perf_counter()
+            for lat, lon in zip(latitudes[:sample], longitudes[:sample]):
+                get_deforestation_data(lat, lon, grid=grid)
+            per_point = (time.perf_counter() - start) * count / sample
+
+            results[count] = {"batch_s": batch, "per_point_s": per_point}
+            print(f"{count:>8} points: batch {batch * 1000:10.3f} ms "
+                  f"({batch / count * 1e9:8.1f} ns/point), "
+                  f"per-point {per_point * 1000:10.3f} ms{' (extrapolated)' if sample < count else ''}")
+
+        grid.loss = None  # Release the memory map before the directory is removed
+
+    return results
+
+
+def benchmark_comparison_chart(analyses=1000, report_every=100):
+    """Redraw time and traced memory of the reused ComparisonChart over many analyses"""
+    import os
+    import tracemalloc
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from comparison_chart import ComparisonChart
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    chart = ComparisonChart()
+    chart.resize(800, 450)
+    chart.show()
+    app.processEvents()
+
+    rng = np.random.default_rng(0)
+    years = list(range(2015, 2025))
+    chart.update_chart(years, rng.uniform(0, 40, len(years)), 2025, 30.0)  # First full draw
+    app.processEvents()
+
+    tracemalloc.start()
+    results = []
+    timings = []
+    for i in range(1, analyses + 1):
+        values = rng.uniform(0, 40, len(years))
+        start = time.perf_counter()
+        chart.update_chart(years, values, 2025, float(rng.uniform(0, 100)))
+        app.processEvents()
+        timings.append(time.perf_counter() - start)
+
+        if i % report_every == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            window = timings[-report_every:]
+            results.append({"analyses": i, "ms_per_redraw": 1000 * sum(window) / len(window),
+                            "traced_bytes": current})
+            print(f"{i:>6} analyses: {results[-1]['ms_per_redraw']:.3f} ms/redraw, "
+                  f"{current / 1024:.1f} KiB traced")
+    tracemalloc.stop()
+    chart.close()
+    return results
+
+
+def benchmark_report_rendering(count=1000, file_format="png", workers=None):
+    """Reports per minute rendered offscreen by Rep.render_reports"""
+    import tempfile
+    from Rep import render_reports
+
+    rng = np.random.default_rng(0)
+    reports = [
+        {
+            "confidence": float(rng.uniform(0, 1)),
+            "deforestation_score": float(rng.uniform(0, 1)),
+            "location": f"{rng.uniform(6, 38):.4f}°, {rng.uniform(68, 98):.4f}°",
+            "date": "2025-01-01 00:00:00"
+        }
+        for _ in range(count)
+    ]
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        written = render_reports(reports, out_dir, file_format=file_format, workers=workers)
+        elapsed = time.perf_counter() - start
+
+    per_minute = len(written) * 60 / elapsed
+    print(f"Rendered {len(written)}/{count} {file_format} reports in {elapsed:.2f} s "
+          f"({per_minute:.0f} reports/minute)")
+    return {"rendered": len(written), "seconds": elapsed, "reports_per_minute": per_minute}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deforestation Analyser benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    batch_parser = subparsers.add_parser("batch", help="Batched poaching model inference")
+    batch_parser.add_argument("model_path")
+    batch_parser.add_argument("--frames", type=int, default=64)
+
+    preprocess_parser = subparsers.add_parser("preprocess", help="Frame preprocessing")
+    preprocess_parser.add_argument("--iterations", type=int, default=500)
+    preprocess_parser.add_argument("--batch-size", type=int, default=1)
+
+    history_parser = subparsers.add_parser("history", help="Historical deforestation lookups")
+    history_parser.add_argument("--repeats", type=int, default=5)
+
+    chart_parser = subparsers.add_parser("chart", help="Comparison chart redraws")
+    chart_parser.add_argument("--analyses", type=int, default=1000)
+
+    reports_parser = subparsers.add_parser("reports", help="Offscreen batch report rendering")
+    reports_parser.add_argument("--count", type=int, default=1000)
+    reports_parser.add_argument("--format", default="png", choices=["png", "jpg", "pdf"])
+    reports_parser.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+
+    if args.benchmark == "batch":
+        benchmark_batched_inference(args.model_path, frames=args.frames)
+    elif args.benchmark == "preprocess":
+        benchmark_preprocessing(args.iterations, args.batch_size)
+    elif args.benchmark == "history":
+        benchmark_history_lookup(repeats=args.repeats)
+    elif args.benchmark == "chart":
+        benchmark_comparison_chart(args.analyses)
+    elif args.benchmark == "reports":
+        benchmark_report_rendering(args.count, args.format, args.workers)
+    sys.exit(0)
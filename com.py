@@ -1,25 +1,33 @@
-import requests
-from datetime import datetime, timedelta
-import json
-import random
-
-def get_deforestation_data(lat, lon):
-    """Generate sample historical deforestation data for given coordinates"""
-    start_year = 2015
-    current_year = datetime.now().year
-    
-    # Generate synthetic historical data
+from datetime import datetime
+import math
+
+# Opened on first lookup; memory-mapped, so this is cheap to keep around
+history_grid = None
+
+
+def get_history_grid():
+    global history_grid
+    if history_grid is None:
+        from history_grid import HistoryGrid
+        history_grid = HistoryGrid()
+    return history_grid
+
+
+def get_deforestation_data(lat, lon, grid=None):
+    """Historical yearly deforestation for given coordinates, from the local history grid"""
+    if grid is None:
+        grid = get_history_grid()
+    values = grid.lookup(lat, lon)
+
+    # Years without data (NaN) are left out; points outside the grid get no history
     historical_data = []
-    base_deforestation = random.uniform(10, 30)  # Base deforestation percentage
-    
-    for year in range(start_year, current_year + 1):
-        deforestation_percent = base_deforestation + random.uniform(-5, 5)
-        deforestation_percent = max(0, min(100, deforestation_percent))  # Clamp between 0-100
-        
-        historical_data.append({
-            'year': year,
-            'deforestation_percent': round(deforestation_percent, 2)
-        })
+    if values is not None:
+        for year, deforestation_percent in zip(grid.years, values.tolist()):
+            if not math.isnan(deforestation_percent):
+                historical_data.append({
+                    'year': year,
+                    'deforestation_percent': round(deforestation_percent, 2)
+                })
     
     return {
         'latitude': lat,
@@ -27,6 +35,21 @@ def get_deforestation_data(lat, lon):
         'historical_data': historical_data
     }
 
+def get_deforestation_batch(latitudes, longitudes, start_year=None, end_year=None, grid=None):
+    """
+    Historical yearly deforestation for many coordinates at once
+
+    Returns:
+        dict: 'years' (list) and 'deforestation_percent', a float32 array of shape
+              (N, len(years)) with NaN where there is no data
+    """
+    if grid is None:
+        grid = get_history_grid()
+    return {
+        'years': grid.years[grid.year_slice(start_year, end_year)],
+        'deforestation_percent': grid.lookup_many(latitudes, longitudes, start_year, end_year)
+    }
+
 def get_user_dates():
     """Get date range from user input"""
     while True:
@@ -44,9 +67,11 @@ def get_user_dates():
 if __name__ == "__main__":
     # Example for Bangalore, India
     start_date, end_date = get_user_dates()
-    result = get_deforestation_data(12.9716, 77.5946, start_date, end_date)
-    if result:
-        print("\nDetails:")
-        print(f"Deforestation risk score: {result['percentage']}%")
-        print(f"Fire points detected: {result['fire_points']}")
-        print(f"Time period: {result['period']}")
\ No newline at end of file
+    start_year, end_year = int(start_date[:4]), int(end_date[:4])
+    result = get_deforestation_data(12.9716, 77.5946)
+    history = [entry for entry in result['historical_data'] if start_year <= entry['year'] <= end_year]
+    print("\nDetails:")
+    if not history:
+        print(f"No history grid data for {start_year}-{end_year}")
+    for entry in history:
+        print(f"{entry['year']}: {entry['deforestation_percent']}% forest loss")
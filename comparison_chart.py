@@ -0,0 +1,90 @@
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+
+
+class ComparisonChart(FigureCanvas):
+    """
+    Historical data vs. model prediction chart, created once and updated in place.
+
+    The upper axes plot the historical series and the current prediction by year.
+    The lower axes plot recent predictions by analysis, the current one at 0, on
+    a fixed x range. Axes, grid and legend are rendered only on a full draw and cached
+    as a background bitmap. Each update restores that bitmap and redraws just the
+    data lines (blitting). Past predictions are kept in a fixed-size ring buffer, so
+    memory stays flat however many analyses are shown.
+    """
+
+    def __init__(self, history_size=200, parent=None):
+        # A bare Figure is not tracked by pyplot, so nothing accumulates across analyses
+        super().__init__(Figure(figsize=(10, 6)))
+        self.setParent(parent)
+
+        # Scores of past analyses, oldest overwritten first
+        self.history = np.full(history_size, np.nan, dtype=np.float32)
+        self.history_next = 0
+        self.history_count = 0
+
+        self.ax, self.trend_ax = self.figure.subplots(2, 1, gridspec_kw={'height_ratios': [3, 1]})
+        self.historical_line, = self.ax.plot([], [], 'b-o', label='Historical Data', animated=True)
+        self.current_line, = self.ax.plot([], [], 'r*', markersize=15,
+                                          label='Current DL Prediction', animated=True)
+        self.ax.set_title('Deforestation Analysis Comparison')
+        self.ax.set_xlabel('Year')
+        self.ax.set_ylabel('Deforestation Percentage (%)')
+        self.ax.set_ylim(0, 100)
+        self.ax.grid(True)
+        self.ax.legend(loc='upper left')
+
+        self.past_line, = self.trend_ax.plot([], [], '-o', color='grey', alpha=0.5, markersize=3,
+                                             animated=True)
+        self.trend_ax.set_title('Prediction Trend', fontsize='small')
+        self.trend_ax.set_xlabel('Analyses ago')
+        self.trend_ax.set_ylabel('%')
+        self.trend_ax.set_xlim(-history_size, 1)  # Fixed, so new analyses never force a full redraw
+        self.trend_ax.set_ylim(0, 100)
+        self.trend_ax.grid(True)
+        self.figure.tight_layout()
+
+        self.background = None
+        self.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event):
+        """Full redraws (first show, resize, new x range) refresh the cached background"""
+        self.background = self.copy_from_bbox(self.figure.bbox)
+        self.draw_lines()
+
+    def draw_lines(self):
+        self.ax.draw_artist(self.historical_line)
+        self.ax.draw_artist(self.current_line)
+        self.trend_ax.draw_artist(self.past_line)
+
+    def add_history(self, score):
+        self.history[self.history_next] = score
+        self.history_next = (self.history_next + 1) % len(self.history)
+        self.history_count = min(self.history_count + 1, len(self.history))
+
+    def past_scores(self):
+        """Past scores, oldest first"""
+        if self.history_count < len(self.history):
+            return self.history[:self.history_count]
+        return np.concatenate([self.history[self.history_next:], self.history[:self.history_next]])
+
+    def update_chart(self, years, values, current_year, score):
+        """Show one analysis: historical (years, values) and the current prediction score (%)"""
+        self.add_history(score)
+        past = self.past_scores()
+        self.past_line.set_data(np.arange(1 - len(past), 1), past)
+        self.historical_line.set_data(years, values)
+        self.current_line.set_data([current_year], [score])
+
+        first_year = min(years) if len(years) else current_year
+        x_limits = (first_year - 1, current_year + 1)
+        if self.background is None or tuple(self.ax.get_xlim()) != x_limits:
+            self.ax.set_xlim(*x_limits)
+            self.draw()  # on_draw re-caches the background and draws the lines
+            return
+
+        self.restore_region(self.background)
+        self.draw_lines()
+        self.blit(self.figure.bbox)
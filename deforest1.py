@@ -3,27 +3,89 @@ import os
 import time
 import cv2
 import numpy as np
-import pickle
 import threading
-import subprocess
-import tempfile
+import queue
+import csv
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
     QPushButton, QLabel, QProgressBar, QFileDialog, QMessageBox
 )
-from PyQt6.QtCore import QTimer, Qt, pyqtSignal, QThread
+from PyQt6.QtCore import Qt, pyqtSignal, QThread
 from PyQt6.QtGui import QImage, QPixmap
-import librosa
 import soundfile as sf
 import joblib
+from evidence_buffer import EvidenceBuffer
+from frame_preprocessing import FramePreprocessor, DisplayFramePool
+from audio_stream import AudioCache
+from audio_workers import AudioAnalyzerPool
+
+class LatestFrameQueue(queue.Queue):
+    """Bounded queue that discards its oldest item instead of blocking the producer"""
+    
+    def put_latest(self, item):
+        """Put an item, evicting the oldest one if full. Returns True if one was dropped"""
+        dropped = False
+        while True:
+            try:
+                self.put_nowait(item)
+                return dropped
+            except queue.Full:
+                try:
+                    self.get_nowait()
+                    dropped = True
+                except queue.Empty:
+                    pass
+
+
+class MotionGate:
+    """Cheap scene-change detector used to skip model calls on static footage"""
+    
+    def __init__(self, threshold=0.02, refresh_interval=60.0, size=(64, 36)):
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+        self.size = size
+        self.reference = None
+        self.reference_time = None
+        self.last_score = 0.0
+    
+    def downsample(self, frame):
+        """Small grayscale thumbnail of the frame"""
+        small = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+    
+    def should_analyze(self, frame, timestamp):
+        """True if the scene changed enough, or the forced refresh is due"""
+        thumbnail = self.downsample(frame)
+        
+        if self.reference is None or timestamp - self.reference_time >= self.refresh_interval:
+            changed = True
+        else:
+            # Mean absolute difference against the last analyzed frame, in [0, 1]
+            self.last_score = float(cv2.absdiff(thumbnail, self.reference).mean()) / 255.0
+            changed = self.last_score >= self.threshold
+        
+        if changed:
+            self.reference = thumbnail
+            self.reference_time = timestamp
+        return changed
+
 
 class VideoProcessingThread(QThread):
     frame_ready = pyqtSignal(np.ndarray)
+    display_frame_ready = pyqtSignal(np.ndarray)
     analysis_ready = pyqtSignal(dict)
     audio_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    stats_ready = pyqtSignal(dict)
+    scan_complete = pyqtSignal(str)
+    scan_cancelled = pyqtSignal()
     
-    def __init__(self, video_path, poaching_model_path, screenshot_interval=5):
+    def __init__(self, video_path, poaching_model_path, screenshot_interval=5,
+                 batch_size=1, batch_timeout=2.0, display_queue_size=8,
+                 inference_queue_size=4, motion_threshold=0.02,
+                 motion_refresh_interval=60.0, scan_mode=False, timeline_path=None,
+                 evidence_capacity=16, evidence_max_bytes=500 * 1024 * 1024,
+                 display_refresh_rate=60.0, audio_sample_rate=22050, audio_channels=1):
         super().__init__()
         self.video_path = video_path
         self.poaching_model_path = poaching_model_path
@@ -31,6 +93,49 @@ class VideoProcessingThread(QThread):
         self.running = True
         self.paused = False
         
+        # Offline scan: run as fast as possible, stop at end of file, record a threat timeline
+        self.scan_mode = scan_mode
+        self.timeline_path = timeline_path or os.path.splitext(video_path)[0] + "_timeline.csv"
+        self.timeline = []
+        
+        # Sampled frames waiting for a batched predict call
+        self.batch_size = max(1, int(batch_size))
+        self.batch_timeout = batch_timeout
+        self.pending_frames = []
+        self.preprocessor = FramePreprocessor(max_batch=self.batch_size)
+        
+        # Audio is decoded at the analyzers' native format and cached by video content
+        self.audio_cache = AudioCache()
+        self.audio_sample_rate = audio_sample_rate
+        self.audio_channels = audio_channels
+        self.audio_samples = None
+        
+        # Recent analyzed frames in memory; high-threat ones are saved as evidence
+        self.evidence = EvidenceBuffer(capacity=evidence_capacity, max_bytes=evidence_max_bytes)
+        
+        # Bounded queues between the decoder, inferencer and presenter stages
+        self.display_queue = queue.Queue(maxsize=display_queue_size)
+        self.inference_queue = LatestFrameQueue(maxsize=inference_queue_size)
+        self.max_display_lag = 1.0
+        
+        # Frames are scaled for display on this thread and handed over in pooled buffers
+        self.display_pool = DisplayFramePool()
+        self.display_interval = 1.0 / display_refresh_rate
+        
+        # Skip the model when the scene has not changed (None disables gating)
+        self.motion_gate = None
+        if motion_threshold is not None:
+            self.motion_gate = MotionGate(motion_threshold, motion_refresh_interval)
+        
+        # Pipeline counters
+        self.decoded_frames = 0
+        self.presented_frames = 0
+        self.dropped_display_frames = 0
+        self.throttled_frames = 0
+        self.dropped_inference_frames = 0
+        self.analyzed_frames = 0
+        self.skipped_inferences = 0
+        
     def run(self):
         try:
             # Load the poaching detection model
@@ -43,44 +148,239 @@ class VideoProcessingThread(QThread):
                 return
                 
             # Get video properties
-            fps = cap.get(cv2.CAP_PROP_FPS)
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
             frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             
-            # Extract audio to temporary file
-            temp_audio_file = self.extract_audio()
-            if temp_audio_file:
-                self.audio_ready.emit(temp_audio_file)
+            # Extract audio in the background so playback starts immediately
+            threading.Thread(target=self.emit_audio, daemon=True).start()
+            
+            if self.scan_mode:
+                self.scan_video(cap)
+                cap.release()
+                return
+            
+            # Decoder and inferencer run on their own threads; this thread presents
+            decoder = threading.Thread(target=self.decode_frames, args=(cap, fps), daemon=True)
+            inferencer = threading.Thread(target=self.run_inference, daemon=True)
+            decoder.start()
+            inferencer.start()
+            
+            self.present_frames(fps)
+            
+            decoder.join()
+            inferencer.join()
+            cap.release()
+            
+        except Exception as e:
+            self.error_occurred.emit(f"Error in video processing: {str(e)}")
+        finally:
+            self.evidence.close()
+    
+    def scan_video(self, cap):
+        """Analyze a recorded video faster than real time and write its threat timeline"""
+        next_sample_ms = 0.0
+        reached_end = False
+        
+        while self.running:
+            if self.paused:
+                time.sleep(0.1)
+                continue
+            
+            # grab() advances without converting the frame; only sampled frames are retrieved
+            if not cap.grab():
+                reached_end = True
+                break
+            self.decoded_frames += 1
             
-            # Process video frames
-            last_screenshot_time = time.time() - self.screenshot_interval  # To ensure first frame is captured
+            position_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+            if position_ms < next_sample_ms:
+                continue
+            next_sample_ms = position_ms + self.screenshot_interval * 1000.0
+            
+            ret, frame = cap.retrieve()
+            if not ret:
+                continue
+            
+            video_time = position_ms / 1000.0
+            if self.motion_gate and not self.motion_gate.should_analyze(frame, video_time):
+                self.skipped_inferences += 1
+                continue
+            
+            self.emit_display_frame(frame)
+            self.pending_frames.append((frame, time.time(), video_time))
+            if len(self.pending_frames) >= self.batch_size:
+                self.flush_batch()
+        
+        self.flush_batch()
+        self.stats_ready.emit(self.pipeline_stats())
+        
+        # A stopped scan covers only part of the video; don't present it as the timeline
+        if not reached_end:
+            self.scan_cancelled.emit()
+            return
+        if self.write_timeline():
+            self.scan_complete.emit(self.timeline_path)
+    
+    def write_timeline(self):
+        """Write the per-timestamp threat timeline collected during a scan as CSV"""
+        try:
+            with open(self.timeline_path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(["video_time", "threat_level", "confidence", "image_path"])
+                for result in self.timeline:
+                    writer.writerow([
+                        f"{result['video_time']:.3f}",
+                        result["threat_level"],
+                        f"{result['confidence']:.2f}",
+                        result["image_path"]
+                    ])
+            print(f"Wrote threat timeline to {self.timeline_path}")
+            return True
+        except Exception as e:
+            self.error_occurred.emit(f"Failed to write timeline: {str(e)}")
+            return False
+    
+    def decode_frames(self, cap, fps):
+        """Decoder stage: read frames and hand them to the presenter and inferencer"""
+        try:
+            frame_interval = 1.0 / fps
+            pts_offset = 0.0
+            last_pts = 0.0
+            last_sample_pts = -self.screenshot_interval  # To ensure first frame is captured
             
             while self.running:
-                if self.paused:
-                    time.sleep(0.1)
-                    continue
-                    
                 ret, frame = cap.read()
                 if not ret:
-                    # Reached end of video, restart
+                    # Reached end of video, restart and keep the timeline increasing
+                    pts_offset = last_pts + frame_interval
                     cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
                     continue
                 
-                # Emit the frame for display
-                self.frame_ready.emit(frame)
+                # Presentation timestamp in seconds from the start of playback
+                last_pts = pts_offset + cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                self.decoded_frames += 1
                 
-                # Check if it's time to take a screenshot
-                current_time = time.time()
-                if current_time - last_screenshot_time >= self.screenshot_interval:
-                    self.process_frame(frame)
-                    last_screenshot_time = current_time
+                # Sample a frame for the model every screenshot_interval seconds of video
+                if last_pts - last_sample_pts >= self.screenshot_interval:
+                    last_sample_pts = last_pts
+                    if self.motion_gate and not self.motion_gate.should_analyze(frame, last_pts):
+                        self.skipped_inferences += 1
+                    elif self.inference_queue.put_latest((frame, time.time(), last_pts)):
+                        self.dropped_inference_frames += 1
                 
-                # Control playback speed based on video FPS
-                time.sleep(1/fps)
+                # Block while the presenter is behind so decoding never runs away
+                while self.running:
+                    try:
+                        self.display_queue.put((last_pts, frame), timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+        
+        except Exception as e:
+            self.error_occurred.emit(f"Error decoding video: {str(e)}")
+    
+    def run_inference(self):
+        """Inferencer stage: batch sampled frames and run the model as fast as it can"""
+        while self.running:
+            # Wait no longer than the oldest pending frame's batch deadline
+            timeout = 0.1
+            if self.pending_frames:
+                waited = time.time() - self.pending_frames[0][1]
+                timeout = max(0.0, min(timeout, self.batch_timeout - waited))
             
-            cap.release()
+            try:
+                self.pending_frames.append(self.inference_queue.get(timeout=timeout))
+            except queue.Empty:
+                pass
             
-        except Exception as e:
-            self.error_occurred.emit(f"Error in video processing: {str(e)}")
+            # Run the model once the batch is full or the oldest frame has waited too long
+            if self.pending_frames and (
+                len(self.pending_frames) >= self.batch_size
+                or time.time() - self.pending_frames[0][1] >= self.batch_timeout
+            ):
+                self.flush_batch()
+        
+        # Analyze whatever was still waiting when monitoring stopped
+        self.flush_batch()
+    
+    def present_frames(self, fps):
+        """Presenter stage: emit frames on the video's own clock, dropping late ones"""
+        frame_interval = 1.0 / fps
+        clock_start = None  # Wall-clock time that corresponds to pts 0
+        last_stats_time = time.monotonic()
+        last_display_time = 0.0
+        
+        while self.running:
+            if self.paused:
+                # Re-anchor the clock on resume so paused time is not counted as lateness
+                clock_start = None
+                time.sleep(0.1)
+                continue
+            
+            try:
+                pts, frame = self.display_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            now = time.monotonic()
+            if clock_start is None:
+                clock_start = now - pts
+            
+            delay = clock_start + pts - now
+            if delay > 0:
+                time.sleep(delay)
+                now = time.monotonic()
+            elif -delay > self.max_display_lag:
+                # Hopelessly behind (e.g. the machine stalled): restart the clock here
+                clock_start = now - pts
+            elif -delay > frame_interval:
+                # Stale frame, skip it to catch up with real time
+                self.dropped_display_frames += 1
+                continue
+            
+            # Never present faster than the screen can refresh
+            if now - last_display_time < self.display_interval:
+                self.throttled_frames += 1
+                continue
+            
+            if not self.emit_display_frame(frame):
+                self.dropped_display_frames += 1
+                continue
+            last_display_time = now
+            self.presented_frames += 1
+            
+            if now - last_stats_time >= 1.0:
+                self.stats_ready.emit(self.pipeline_stats())
+                last_stats_time = now
+    
+    def emit_display_frame(self, frame):
+        """
+        Hand a frame to the GUI, scaled and converted to RGB in a pooled buffer once the
+        display size is known. Returns False if the GUI still holds every buffer.
+        """
+        if self.display_pool.target is None:
+            self.frame_ready.emit(frame)
+            return True
+        buffer = self.display_pool.acquire(frame)
+        if buffer is None:
+            return False
+        self.display_frame_ready.emit(buffer)
+        return True
+    
+    def pipeline_stats(self):
+        """Queue depths and frame counters for the three pipeline stages"""
+        return {
+            "display_queue": self.display_queue.qsize(),
+            "inference_queue": self.inference_queue.qsize(),
+            "pending_batch": len(self.pending_frames),
+            "decoded_frames": self.decoded_frames,
+            "presented_frames": self.presented_frames,
+            "dropped_display_frames": self.dropped_display_frames,
+            "throttled_frames": self.throttled_frames,
+            "dropped_inference_frames": self.dropped_inference_frames,
+            "analyzed_frames": self.analyzed_frames,
+            "skipped_inferences": self.skipped_inferences
+        }
     
     def load_poaching_model(self):
         try:
@@ -91,90 +391,96 @@ class VideoProcessingThread(QThread):
             self.poaching_model = None
     
     def extract_audio(self):
+        """Decode the audio track into memory (cached by video content) and return its WAV path"""
         try:
-            # Create a temporary file for the audio
-            temp_audio_file = tempfile.mktemp(suffix='.wav')
-            
-            # Check if ffmpeg is available
-            try:
-                subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-            except FileNotFoundError:
-                self.error_occurred.emit("FFmpeg not found. Please install FFmpeg and add it to your system PATH")
-                return None
-            
             # Check if video file exists
             if not os.path.exists(self.video_path):
                 self.error_occurred.emit(f"Video file not found: {self.video_path}")
                 return None
-                
-            # Use ffmpeg to extract audio
-            command = [
-                'ffmpeg', 
-                '-i', self.video_path, 
-                '-vn',  # No video
-                '-acodec', 'pcm_s16le',  # PCM format
-                '-ar', '44100',  # 44.1kHz
-                '-ac', '2',  # Stereo
-                '-y',  # Overwrite output file
-                temp_audio_file
-            ]
             
-            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            key, samples = self.audio_cache.extract(
+                self.video_path, self.audio_sample_rate, self.audio_channels
+            )
+            self.audio_samples = samples
             
-            if result.returncode != 0:
-                self.error_occurred.emit(f"FFmpeg error: {result.stderr}")
-                return None
-                
-            print(f"Extracted audio to {temp_audio_file}")
-            return temp_audio_file
+            print(f"Audio for {self.video_path} available as {self.audio_cache.audio_path(key)}")
+            return self.audio_cache.audio_path(key)
             
+        except FileNotFoundError:
+            self.error_occurred.emit("FFmpeg not found. Please install FFmpeg and add it to your system PATH")
+            return None
         except Exception as e:
             self.error_occurred.emit(f"Failed to extract audio: {str(e)}")
             return None
     
+    def emit_audio(self):
+        """Extract audio off the playback path and announce it when ready"""
+        audio_file = self.extract_audio()
+        if audio_file:
+            self.audio_ready.emit(audio_file)
+    
     def process_frame(self, frame):
+        """Analyze a single frame (a batch of one)"""
+        self.process_batch([(frame, time.time(), None)])
+    
+    def flush_batch(self):
+        """Run the model on all pending frames"""
+        if not self.pending_frames:
+            return
+        batch = self.pending_frames
+        self.pending_frames = []
+        self.process_batch(batch)
+    
+    def process_batch(self, batch):
+        """Analyze a list of (frame, timestamp, video_time) tuples with one predict call"""
         try:
             # Check if model is loaded
             if self.poaching_model is None:
                 self.error_occurred.emit("Poaching model not loaded. Skipping analysis.")
                 return
             
-            # Prepare the image for the model
-            img_features = self.extract_image_features(frame)
-            if img_features is None:
-                return
+            # Prepare the images for the model as one (N, 224, 224, 3) tensor
+            img_features = self.preprocessor.process([frame for frame, _, _ in batch])
             
-            # Make prediction using the poaching model
+            # Make predictions for the whole batch at once
             predictions = self.poaching_model.predict(img_features, verbose=0)
             
-            # For binary classification, get the probability of class 1
-            confidence = float(predictions[0][0] * 100)
-            
-            # Determine threat level based on confidence threshold
-            threat_level = "High" if confidence > 50 else "Low"
-            
-            # Create a list of detected objects (placeholder)
-            detected_objects = ["Human", "Vehicle"] if threat_level == "High" else []
-            
-            # Save the frame as a temporary image file
-            temp_img_path = tempfile.mktemp(suffix='.jpg')
-            cv2.imwrite(temp_img_path, frame)
-            
-            # Prepare results
-            results = {
-                "threat_level": threat_level,
-                "confidence": confidence,
-                "detected_objects": detected_objects,
-                "image_path": temp_img_path,
-                "timestamp": time.time()
-            }
-            
-            # Emit results
-            self.analysis_ready.emit(results)
+            # Emit the results in the order the frames were sampled
+            for (frame, timestamp, video_time), prediction in zip(batch, predictions):
+                results = self.build_results(frame, prediction, timestamp, video_time)
+                if self.scan_mode:
+                    self.timeline.append(results)
+                self.analysis_ready.emit(results)
+            self.analyzed_frames += len(batch)
             
         except Exception as e:
             self.error_occurred.emit(f"Error processing frame: {str(e)}")
     
+    def build_results(self, frame, prediction, timestamp, video_time=None):
+        """Turn one model output row into the analysis_ready payload"""
+        # For binary classification, get the probability of class 1
+        confidence = float(prediction[0] * 100)
+        
+        # Determine threat level based on confidence threshold
+        threat_level = "High" if confidence > 50 else "Low"
+        
+        # Create a list of detected objects (placeholder)
+        detected_objects = ["Human", "Vehicle"] if threat_level == "High" else []
+        
+        # Only high-threat frames are written to disk, on the evidence writer thread
+        image_path = self.evidence.save(frame, timestamp) if threat_level == "High" else None
+        
+        results = {
+            "threat_level": threat_level,
+            "confidence": confidence,
+            "detected_objects": detected_objects,
+            "image_path": image_path,
+            "timestamp": timestamp,
+            "video_time": video_time
+        }
+        self.evidence.add(frame, results)
+        return results
+    
     def extract_image_features(self, frame):
         """Extract features from the image for the poaching detection model"""
         try:
@@ -196,6 +502,10 @@ class VideoProcessingThread(QThread):
             print(f"Error in image preprocessing: {str(e)}")
             return None
     
+    def set_display_size(self, width, height):
+        """Size of the widget frames are shown in, so they can be scaled before hand-over"""
+        self.display_pool.set_target(width, height)
+    
     def stop(self):
         self.running = False
     
@@ -204,89 +514,228 @@ class VideoProcessingThread(QThread):
         return self.paused
 
 
-class AudioAnalysisThread(QThread):
-    analysis_complete = pyqtSignal(dict)
-    error_occurred = pyqtSignal(str)
+class MultiStreamMonitorThread(VideoProcessingThread):
+    """
+    Monitor every video in a folder at once with a shared pool of model workers.
     
-    def __init__(self, audio_file, deact_script_path, bird_script_path):
-        super().__init__()
-        self.audio_file = audio_file
-        self.deact_script_path = deact_script_path
-        self.bird_script_path = bird_script_path
+    Each worker thread loads its own copy of the model, so memory grows with
+    workers; by default there is one per CPU core, and never more than streams.
+    """
+    streams_ready = pyqtSignal(dict)
+    
+    def __init__(self, video_paths, poaching_model_path, workers=None, **kwargs):
+        super().__init__(video_paths[0] if video_paths else "", poaching_model_path, **kwargs)
+        self.video_paths = list(video_paths)
+        
+        # One model instance per worker, shared by all streams
+        self.workers = workers or max(1, min(os.cpu_count() or 1, len(self.video_paths)))
+        self.work_queue = LatestFrameQueue(maxsize=max(self.batch_size, 4) * self.workers)
+        
+        self.decoders_done = False
+        self.stats_lock = threading.Lock()
+        self.stream_stats = {
+            path: {"decoded_frames": 0, "analyzed_frames": 0, "skipped_inferences": 0,
+                   "dropped_frames": 0, "started": None}
+            for path in self.video_paths
+        }
     
     def run(self):
         try:
-            # Process audio with deact.py
-            deact_results = self.process_with_deact()
-            
-            # Process audio with bird detection
-            bird_results = self.process_with_bird_detection()
+            decoders = [
+                threading.Thread(target=self.decode_stream, args=(path,), daemon=True)
+                for path in self.video_paths
+            ]
+            workers = [
+                threading.Thread(target=self.inference_worker, args=(i,), daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in decoders + workers:
+                thread.start()
             
-            # Combine results
-            results = {
-                "deact_results": deact_results,
-                "bird_results": bird_results
-            }
-            
-            self.analysis_complete.emit(results)
+            # Report per-stream throughput until every stream has finished
+            while self.running and any(thread.is_alive() for thread in decoders):
+                time.sleep(1.0)
+                self.streams_ready.emit(self.throughput())
             
+            for thread in decoders:
+                thread.join()
+            self.decoders_done = True
+            for thread in workers:
+                thread.join()
+            self.streams_ready.emit(self.throughput())
+        
         except Exception as e:
-            self.error_occurred.emit(f"Error in audio analysis: {str(e)}")
+            self.error_occurred.emit(f"Error in multi-stream monitoring: {str(e)}")
+        finally:
+            self.evidence.close()
     
-    def process_with_deact(self):
+    def decode_stream(self, path):
+        """Decoder for one camera feed: sample frames by video timestamp into the shared queue"""
         try:
-            # Execute deact.py with the audio file
-            command = [
-                'python', 
-                self.deact_script_path, 
-                self.audio_file
-            ]
+            cap = cv2.VideoCapture(path)
+            if not cap.isOpened():
+                self.error_occurred.emit(f"Error: Could not open video file {path}")
+                return
             
-            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            stats = self.stream_stats[path]
+            stats["started"] = time.monotonic()
+            motion_gate = None
+            if self.motion_gate:
+                motion_gate = MotionGate(self.motion_gate.threshold, self.motion_gate.refresh_interval)
             
-            if result.returncode != 0:
-                print(f"Warning: deact.py returned non-zero exit code: {result.returncode}")
-                print(f"Error output: {result.stderr}")
+            pts_offset = 0.0
+            last_pts = 0.0
+            next_sample = 0.0
+            clock_start = time.monotonic()
             
-            # Parse the output (adjust based on your deact.py output format)
-            return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode
-            }
+            while self.running:
+                if self.paused:
+                    time.sleep(0.1)
+                    continue
+                
+                # Frames that are not sampled are only grabbed, never retrieved
+                if not cap.grab():
+                    if self.scan_mode:
+                        break  # End of file
+                    pts_offset = last_pts
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                    continue
+                
+                last_pts = pts_offset + cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                stats["decoded_frames"] += 1
+                
+                # Live streams are paced by their own timestamps
+                if not self.scan_mode:
+                    delay = clock_start + last_pts - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                
+                if last_pts < next_sample:
+                    continue
+                next_sample = last_pts + self.screenshot_interval
+                
+                ret, frame = cap.retrieve()
+                if not ret:
+                    continue
+                
+                if motion_gate and not motion_gate.should_analyze(frame, last_pts):
+                    with self.stats_lock:
+                        stats["skipped_inferences"] += 1
+                    continue
+                
+                if self.work_queue.put_latest((path, frame, time.time(), last_pts)):
+                    with self.stats_lock:
+                        stats["dropped_frames"] += 1
             
+            cap.release()
+        
         except Exception as e:
-            print(f"Error executing deact.py: {str(e)}")
-            return {"error": str(e)}
+            self.error_occurred.emit(f"Error decoding {path}: {str(e)}")
     
-    def process_with_bird_detection(self):
+    def inference_worker(self, worker_id):
+        """Worker that loads the model once and serves batches from every stream"""
+        preprocessor = FramePreprocessor(max_batch=self.batch_size)
         try:
-            # Execute bird detection script with the audio file
-            command = [
-                'python', 
-                self.bird_script_path, 
-                self.audio_file
-            ]
+            model = joblib.load(self.poaching_model_path)
+            print(f"Worker {worker_id} loaded poaching detection model")
+        except Exception as e:
+            self.error_occurred.emit(f"Worker {worker_id} failed to load poaching model: {str(e)}")
+            return
+        
+        while self.running:
+            # Collect a batch, waiting at most batch_timeout after its first frame
+            batch = []
+            deadline = None
+            while len(batch) < self.batch_size and self.running:
+                timeout = 0.1 if deadline is None else max(0.0, min(0.1, deadline - time.time()))
+                try:
+                    item = self.work_queue.get(timeout=timeout)
+                except queue.Empty:
+                    if self.decoders_done or (deadline is not None and time.time() >= deadline):
+                        break
+                    continue
+                if deadline is None:
+                    deadline = time.time() + self.batch_timeout
+                batch.append(item)
             
-            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            if not batch:
+                if self.decoders_done:
+                    return
+                continue
             
-            if result.returncode != 0:
-                print(f"Warning: bird detection script returned non-zero exit code: {result.returncode}")
-                print(f"Error output: {result.stderr}")
+            try:
+                img_features = preprocessor.process([frame for _, frame, _, _ in batch])
+                predictions = model.predict(img_features, verbose=0)
+                
+                for (path, frame, timestamp, video_time), prediction in zip(batch, predictions):
+                    results = self.build_results(frame, prediction, timestamp, video_time)
+                    results["stream"] = path
+                    with self.stats_lock:
+                        self.stream_stats[path]["analyzed_frames"] += 1
+                    self.emit_display_frame(frame)
+                    self.analysis_ready.emit(results)
             
-            # Parse the output (adjust based on your bird detection script output format)
-            return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode
-            }
+            except Exception as e:
+                self.error_occurred.emit(f"Error processing frames in worker {worker_id}: {str(e)}")
+    
+    def throughput(self):
+        """Decoded and analyzed frames per second for every stream"""
+        now = time.monotonic()
+        report = {}
+        with self.stats_lock:
+            for path, stats in self.stream_stats.items():
+                elapsed = now - stats["started"] if stats["started"] else 0.0
+                report[path] = {
+                    "decode_fps": stats["decoded_frames"] / elapsed if elapsed else 0.0,
+                    "analyzed_per_min": 60.0 * stats["analyzed_frames"] / elapsed if elapsed else 0.0,
+                    "analyzed_frames": stats["analyzed_frames"],
+                    "skipped_inferences": stats["skipped_inferences"],
+                    "dropped_frames": stats["dropped_frames"]
+                }
+        return report
+
+
+class AudioAnalysisThread(QThread):
+    analysis_complete = pyqtSignal(dict)
+    error_occurred = pyqtSignal(str)
+    
+    def __init__(self, audio_file, analyzer_pool, cache=None):
+        super().__init__()
+        self.audio_file = audio_file
+        self.analyzer_pool = analyzer_pool
+        self.cache = cache or AudioCache()
+    
+    def run(self):
+        try:
+            # Audio from a video analyzed before: reuse its results
+            cache_key = self.cache.key_for_audio_path(self.audio_file)
+            cached = self.cache.load_features(cache_key) if cache_key else None
+            if cached is not None:
+                self.analysis_complete.emit(cached)
+                return
+            
+            # Hand the samples to the persistent workers instead of re-reading the file there
+            samples = self.cache.load_audio(cache_key) if cache_key else None
+            sample_rate = sf.info(self.audio_file).samplerate
+            if samples is None:
+                samples, sample_rate = sf.read(self.audio_file, dtype='float32', always_2d=True)
+            
+            # deact and bird detection run concurrently in the pool
+            results = self.analyzer_pool.analyze(samples, sample_rate, self.audio_file)
+            
+            # Only cache complete runs so a failing analyzer is retried next time
+            if cache_key and not any('error' in r for r in results.values()):
+                self.cache.store_features(cache_key, results)
+            
+            self.analysis_complete.emit(results)
             
         except Exception as e:
-            print(f"Error executing bird detection script: {str(e)}")
-            return {"error": str(e)}
+            self.error_occurred.emit(f"Error in audio analysis: {str(e)}")
 
 
 class ForestMonitoringApp(QMainWindow):
+    closed = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Forest Monitoring System")
@@ -301,8 +750,15 @@ class ForestMonitoringApp(QMainWindow):
         # Initialize variables
         self.video_thread = None
         self.audio_thread = None
+        self.audio_pool = None
         self.current_video_path = None
         
+        # Multi-stream inference: worker count (None = one per core, at most one per
+        # stream), frames per predict call, and the longest a batch waits to fill
+        self.stream_workers = None
+        self.stream_batch_size = 8
+        self.stream_batch_timeout = 5.0
+        
         # Setup UI
         self.init_ui()
         
@@ -331,6 +787,14 @@ class ForestMonitoringApp(QMainWindow):
         self.play_button.clicked.connect(self.toggle_monitoring)
         controls_layout.addWidget(self.play_button)
         
+        self.multi_button = QPushButton("Monitor All Videos")
+        self.multi_button.clicked.connect(self.start_multi_monitoring)
+        controls_layout.addWidget(self.multi_button)
+        
+        self.scan_button = QPushButton("Scan Recorded Video")
+        self.scan_button.clicked.connect(self.start_scan)
+        controls_layout.addWidget(self.scan_button)
+        
         self.select_folder_button = QPushButton("Select Video Folder")
         self.select_folder_button.clicked.connect(self.select_video_folder)
         controls_layout.addWidget(self.select_folder_button)
@@ -350,14 +814,22 @@ class ForestMonitoringApp(QMainWindow):
         
         main_layout.addLayout(status_layout)
         
+        # Pipeline queue depths and dropped-frame counters
+        self.pipeline_label = QLabel("")
+        main_layout.addWidget(self.pipeline_label)
+        
+        # Per-stream throughput when monitoring several videos
+        self.streams_label = QLabel("")
+        main_layout.addWidget(self.streams_label)
+        
         # Results area
         results_layout = QVBoxLayout()
         
         self.poaching_results_label = QLabel("Poaching Detection Results:")
         results_layout.addWidget(self.poaching_results_label)
         
-        # self.audio_results_label = QLabel("Audio Analysis Results:")
-        # results_layout.addWidget(self.audio_results_label)
+        self.audio_results_label = QLabel("Audio Analysis Results:")
+        results_layout.addWidget(self.audio_results_label)
         
         main_layout.addLayout(results_layout)
         
@@ -409,7 +881,46 @@ class ForestMonitoringApp(QMainWindow):
         else:
             self.stop_monitoring()
     
-    def start_monitoring(self):
+    def start_multi_monitoring(self):
+        """Monitor every video in the folder concurrently with one aggregated feed"""
+        if self.video_thread is not None and self.video_thread.isRunning():
+            return
+        
+        videos = self.find_video_files()
+        if not videos:
+            QMessageBox.warning(self, "No Videos Found", 
+                f"No video files found in {self.video_folder}. Please add videos or select a different folder.")
+            return
+        
+        # Update UI
+        self.play_button.setText("Stop Monitoring")
+        self.status_label.setText(f"Monitoring {len(videos)} streams from: {self.video_folder}")
+        self.progress_bar.setVisible(True)
+        
+        # Start the multi-stream thread; results from all streams share one feed.
+        # Each stream samples once per screenshot_interval (5 s), so a batch timeout of
+        # that length lets a worker's batch collect one frame from several streams
+        self.video_thread = MultiStreamMonitorThread(
+            videos, self.poaching_model_path,
+            workers=self.stream_workers,
+            batch_size=min(self.stream_batch_size, len(videos)),
+            batch_timeout=self.stream_batch_timeout
+        )
+        self.video_thread.set_display_size(self.video_label.width(), self.video_label.height())
+        self.video_thread.frame_ready.connect(self.update_frame)
+        self.video_thread.display_frame_ready.connect(self.update_display_frame)
+        self.video_thread.analysis_ready.connect(self.update_analysis_results)
+        self.video_thread.error_occurred.connect(self.handle_error)
+        self.video_thread.streams_ready.connect(self.update_stream_stats)
+        self.video_thread.start()
+    
+    def start_scan(self):
+        """Scan the recorded video faster than real time instead of playing it"""
+        if self.video_thread is not None and self.video_thread.isRunning():
+            return
+        self.start_monitoring(scan_mode=True)
+    
+    def start_monitoring(self, scan_mode=False):
         # Find available videos
         videos = self.find_video_files()
         
@@ -423,18 +934,29 @@ class ForestMonitoringApp(QMainWindow):
         
         # Update UI
         self.play_button.setText("Stop Monitoring")
-        self.status_label.setText(f"Monitoring from: {self.current_video_path}")
+        action = "Scanning" if scan_mode else "Monitoring from"
+        self.status_label.setText(f"{action}: {self.current_video_path}")
         self.progress_bar.setVisible(True)
         
-        # Start video processing thread
+        # Start video processing thread. A scan samples frames much faster than real
+        # time, so batches fill; live playback yields one sample per interval, so it
+        # runs the model on each sample as soon as it arrives
         self.video_thread = VideoProcessingThread(
             self.current_video_path, 
-            self.poaching_model_path
+            self.poaching_model_path,
+            batch_size=8 if scan_mode else 1,
+            scan_mode=scan_mode,
+            display_refresh_rate=self.screen().refreshRate() or 60.0
         )
+        self.video_thread.set_display_size(self.video_label.width(), self.video_label.height())
         self.video_thread.frame_ready.connect(self.update_frame)
+        self.video_thread.display_frame_ready.connect(self.update_display_frame)
         self.video_thread.analysis_ready.connect(self.update_analysis_results)
         self.video_thread.audio_ready.connect(self.process_audio)
         self.video_thread.error_occurred.connect(self.handle_error)
+        self.video_thread.stats_ready.connect(self.update_pipeline_stats)
+        self.video_thread.scan_complete.connect(self.handle_scan_complete)
+        self.video_thread.scan_cancelled.connect(self.handle_scan_cancelled)
         self.video_thread.start()
     
     def stop_monitoring(self):
@@ -447,6 +969,22 @@ class ForestMonitoringApp(QMainWindow):
         self.status_label.setText("Monitoring stopped")
         self.progress_bar.setVisible(False)
     
+    def update_display_frame(self, buffer):
+        """Show a frame the worker already scaled and converted to RGB"""
+        h, w, ch = buffer.shape
+        qt_image = QImage(buffer.data, w, h, ch * w, QImage.Format.Format_RGB888)
+        
+        # fromImage copies the pixels, so the buffer can go straight back to the pool
+        self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+        if self.video_thread is not None:
+            self.video_thread.display_pool.release(buffer)
+    
+    def resizeEvent(self, event):
+        """Keep the worker scaling frames to the current size of the video area"""
+        super().resizeEvent(event)
+        if self.video_thread is not None and self.video_thread.isRunning():
+            self.video_thread.set_display_size(self.video_label.width(), self.video_label.height())
+    
     def update_frame(self, frame):
         """Update the video display with the current frame"""
         h, w, ch = frame.shape
@@ -466,11 +1004,43 @@ class ForestMonitoringApp(QMainWindow):
         # Set the pixmap to the label
         self.video_label.setPixmap(pixmap)
     
+    def handle_scan_complete(self, timeline_path):
+        """Reset the controls once an offline scan reaches the end of the file"""
+        self.play_button.setText("Start Monitoring")
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(f"Scan complete. Threat timeline saved to {timeline_path}")
+    
+    def handle_scan_cancelled(self):
+        """A scan stopped before the end of the file writes no timeline"""
+        self.status_label.setText("Scan cancelled before the end of the video; no timeline written")
+    
+    def update_stream_stats(self, report):
+        """Show throughput for each monitored stream"""
+        lines = [
+            f"{os.path.basename(path)}: {stats['decode_fps']:.1f} fps decoded, "
+            f"{stats['analyzed_per_min']:.1f} analyses/min, "
+            f"{stats['skipped_inferences']} skipped, {stats['dropped_frames']} dropped"
+            for path, stats in report.items()
+        ]
+        self.streams_label.setText("\n".join(lines))
+    
+    def update_pipeline_stats(self, stats):
+        """Show queue depths and dropped-frame counters of the video pipeline"""
+        self.pipeline_label.setText(
+            f"Display queue: {stats['display_queue']} | "
+            f"Inference queue: {stats['inference_queue']} | "
+            f"Dropped (display/inference): {stats['dropped_display_frames']}/{stats['dropped_inference_frames']} | "
+            f"Analyzed: {stats['analyzed_frames']} | "
+            f"Skipped (no motion): {stats['skipped_inferences']}"
+        )
+    
     def update_analysis_results(self, results):
         """Update UI with poaching detection results"""
         # Format the results
+        stream = results.get('stream')
+        source = f"\n        - Stream: {os.path.basename(stream)}" if stream else ""
         detection_text = f"""
-        Poaching Detection Results:
+        Poaching Detection Results:{source}
         - Confidence: {results.get('confidence', 0):.2f}%
         - Detected Objects: {', '.join(results.get('detected_objects', ['None']))}
         - Timestamp: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(results.get('timestamp', time.time())))}
@@ -486,37 +1056,29 @@ class ForestMonitoringApp(QMainWindow):
         """Process the extracted audio file with deact.py and bird detection"""
         self.status_label.setText(f"Processing audio file: {audio_file}")
         
+        # Audio models are loaded once, the first time audio needs analyzing
+        if self.audio_pool is None:
+            self.audio_pool = AudioAnalyzerPool(self.deact_script_path, self.bird_script_path)
+        
         # Start audio analysis thread
-        self.audio_thread = AudioAnalysisThread(
-            audio_file, 
-            self.deact_script_path,
-            self.bird_script_path
-        )
+        self.audio_thread = AudioAnalysisThread(audio_file, self.audio_pool)
         self.audio_thread.analysis_complete.connect(self.update_audio_results)
         self.audio_thread.error_occurred.connect(self.handle_error)
         self.audio_thread.start()
     
     def update_audio_results(self, results):
         """Update UI with audio analysis results"""
-        # Format deact.py results
-        deact_results = results.get('deact_results', {})
-        deact_text = "Audio Analysis (deact.py):\n"
-        
-        if 'error' in deact_results:
-            deact_text += f"- Error: {deact_results['error']}\n"
-        else:
-            deact_stdout = deact_results.get('stdout', '')
-            deact_text += f"- Output: {deact_stdout[:200]}...\n" if len(deact_stdout) > 200 else f"- Output: {deact_stdout}\n"
+        def format_result(title, result):
+            text = f"{title}:\n"
+            if 'error' in result:
+                return text + f"- Error: {result['error']}\n"
+            for key, value in result.items():
+                value = str(value)
+                text += f"- {key.capitalize()}: {value[:200]}...\n" if len(value) > 200 else f"- {key.capitalize()}: {value}\n"
+            return text
         
-        # Format bird detection results
-        bird_results = results.get('bird_results', {})
-        bird_text = "Bird Sound Detection:\n"
-        
-        if 'error' in bird_results:
-            bird_text += f"- Error: {bird_results['error']}\n"
-        else:
-            bird_stdout = bird_results.get('stdout', '')
-            bird_text += f"- Output: {bird_stdout[:200]}...\n" if len(bird_stdout) > 200 else f"- Output: {bird_stdout}\n"
+        deact_text = format_result("Audio Analysis (deact.py)", results.get('deact_results', {}))
+        bird_text = format_result("Bird Sound Detection", results.get('bird_results', {}))
         
         # Update the label
         self.audio_results_label.setText(deact_text + "\n" + bird_text)
@@ -525,6 +1087,17 @@ class ForestMonitoringApp(QMainWindow):
         """Handle errors from threads"""
         self.status_label.setText(f"Error: {error_message}")
         print(f"Error: {error_message}")
+    
+    def closeEvent(self, event):
+        """Stop the video thread and the audio worker processes before closing"""
+        self.stop_monitoring()
+        if self.audio_thread is not None and self.audio_thread.isRunning():
+            self.audio_thread.wait()
+        if self.audio_pool is not None:
+            self.audio_pool.shutdown()
+            self.audio_pool = None
+        super().closeEvent(event)
+        self.closed.emit()
 
 
 if __name__ == "__main__":
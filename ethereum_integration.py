@@ -1,12 +1,218 @@
 import json
 import time
-from web3 import Web3
+import queue
+import threading
+
+# Field order of the contract's Alert struct, as returned by getRecentAlerts
+ALERT_FIELDS = ("id", "alertType", "timestamp", "latitude", "longitude", "deforestation")
+
+
+def to_hex(tx_hash):
+    """Transaction hash as a 0x-prefixed hex string, the one form stored and passed around"""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        # bytes.hex() never adds the prefix; HexBytes.hex() does only on older hexbytes
+        return "0x" + bytes(tx_hash).hex()
+    tx_hash = str(tx_hash)
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+class AlertSubmissionQueue:
+    """
+    Background pipeline that submits alerts without waiting on the chain.
+
+    Nonces are allocated locally so several transactions can be in flight at once,
+    gas price and gas estimates are cached for a short time, and a separate poller
+    thread collects receipts and hands each result to the submitter's callback.
+
+    The chain object only needs get_nonce, gas_price, estimate_gas(args),
+    send_alert(args, nonce, gas, gas_price) and get_receipt(tx_hash), as
+    EthereumBlockchain provides (tests use an in-process chain).
+    """
+
+    def __init__(self, chain, max_in_flight=8, poll_interval=2.0, receipt_timeout=120,
+                 gas_price_ttl=30, gas_estimate_ttl=600):
+        self.chain = chain
+        self.poll_interval = poll_interval
+        self.receipt_timeout = receipt_timeout
+        self.gas_price_ttl = gas_price_ttl
+        self.gas_estimate_ttl = gas_estimate_ttl
+
+        self.jobs = queue.Queue()
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+        self.lock = threading.Lock()
+        self.pending = {}  # tx_hash -> (sent_at, callback)
+
+        self.nonce = None
+        self.gas_price_cache = (None, 0.0)
+        self.gas_estimate_cache = {}
+
+        self.running = True
+        self.sender = threading.Thread(target=self.send_loop, daemon=True, name="alert-sender")
+        self.poller = threading.Thread(target=self.poll_loop, daemon=True, name="alert-receipts")
+        self.sender.start()
+        self.poller.start()
+
+    def submit(self, args, callback=None, sent_callback=None):
+        """
+        Queue storeAlert(*args); callback(result) runs on the receipt thread when done.
+        sent_callback(tx_hash), if given, runs with the 0x hex hash as soon as the
+        transaction is broadcast.
+        """
+        self.jobs.put((args, callback, sent_callback))
+
+    def next_nonce(self):
+        """Hand out nonces locally, asking the node only the first time or after a resync"""
+        with self.lock:
+            if self.nonce is None:
+                self.nonce = self.chain.get_nonce()
+            nonce = self.nonce
+            self.nonce += 1
+            return nonce
+
+    def resync_nonce(self):
+        with self.lock:
+            self.nonce = None
+
+    def cached_gas_price(self):
+        value, fetched_at = self.gas_price_cache
+        if value is None or time.time() - fetched_at > self.gas_price_ttl:
+            value = self.chain.gas_price()
+            self.gas_price_cache = (value, time.time())
+        return value
+
+    def cached_gas_estimate(self, args):
+        """Gas depends on the alert type and the length of the strings, not their values"""
+        key = tuple(len(a) if isinstance(a, str) else a for a in args)
+        value, fetched_at = self.gas_estimate_cache.get(key, (None, 0.0))
+        if value is None or time.time() - fetched_at > self.gas_estimate_ttl:
+            value = self.chain.estimate_gas(args)
+            self.gas_estimate_cache[key] = (value, time.time())
+        return value
+
+    def send_loop(self):
+        while self.running:
+            try:
+                args, callback, sent_callback = self.jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            self.in_flight.acquire()
+            nonce = None
+            try:
+                gas = int(self.cached_gas_estimate(args) * 1.2)
+                gas_price = self.cached_gas_price()
+                nonce = self.next_nonce()
+                tx_hash = self.chain.send_alert(args, nonce, gas, gas_price)
+            except Exception as e:
+                # Whatever the error, the node may not have taken this nonce; reusing the
+                # local count would leave a gap that stalls every later transaction
+                if nonce is not None:
+                    self.resync_nonce()
+                self.in_flight.release()
+                print(f"Error storing alert in blockchain: {str(e)}")
+                self.notify(callback, {"status": "error", "message": str(e)})
+                continue
+
+            with self.lock:
+                self.pending[tx_hash] = (time.time(), callback)
+            self.notify(sent_callback, to_hex(tx_hash))
+
+    def poll_loop(self):
+        while self.running:
+            time.sleep(self.poll_interval)
+            with self.lock:
+                pending = list(self.pending.items())
+
+            for tx_hash, (sent_at, callback) in pending:
+                try:
+                    receipt = self.chain.get_receipt(tx_hash)
+                except Exception as e:
+                    print(f"Error polling receipt: {str(e)}")
+                    receipt = None
+
+                if receipt is not None:
+                    result = {
+                        "status": "success",
+                        "transaction_hash": to_hex(receipt["transactionHash"]),
+                        "block_number": receipt["blockNumber"],
+                        "gas_used": receipt["gasUsed"],
+                        "timestamp": int(time.time())
+                    }
+                elif time.time() - sent_at > self.receipt_timeout:
+                    # A dropped transaction frees its nonce; ask the node again for the next one
+                    self.resync_nonce()
+                    result = {"status": "error", "message": f"No receipt after {self.receipt_timeout} s"}
+                else:
+                    continue
+
+                with self.lock:
+                    self.pending.pop(tx_hash, None)
+                self.in_flight.release()
+                self.notify(callback, result)
+
+    def notify(self, callback, value):
+        if callback is None:
+            return
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"Error in blockchain callback: {str(e)}")
+
+    def stop(self):
+        self.running = False
+
+
+class AlertSubmitter:
+    """
+    submit_deforestation_alert on top of the chain interface AlertSubmissionQueue uses.
+
+    Subclasses provide get_nonce, gas_price, estimate_gas, send_alert and get_receipt;
+    get_receipt must accept the 0x hex hashes that results and sent callbacks carry.
+    """
+    submission_queue = None  # Background pipeline, started on first submit
+
+    def alert_args(self, latitude, longitude, deforestation_score):
+        """storeAlert arguments for a score, or None if the area is not deforested"""
+        is_deforestation = deforestation_score > 0.4
+        if not is_deforestation:
+            return None
+        return ("DEFORESTED", str(latitude), str(longitude), is_deforestation)
+
+    def submit_deforestation_alert(self, latitude, longitude, deforestation_score, callback=None,
+                                   sent_callback=None):
+        """
+        Queue an alert for background submission and return immediately
+
+        Args:
+            latitude: Latitude coordinate
+            longitude: Longitude coordinate
+            deforestation_score: Score from the model (0-1)
+            callback: Called with the same result dict store_deforestation_alert returns,
+                      on a background thread, once the receipt arrives or submission fails
+            sent_callback: Called with the transaction hash once it is broadcast
+
+        Returns:
+            dict: {"status": "queued"} or {"status": "skipped", ...}
+        """
+        args = self.alert_args(latitude, longitude, deforestation_score)
+        if args is None:
+            return {"status": "skipped", "message": "Area classified as forest, not storing in blockchain"}
+
+        if self.submission_queue is None:
+            self.submission_queue = AlertSubmissionQueue(self)
+        self.submission_queue.submit(args, callback, sent_callback)
+        return {"status": "queued"}
+
+
+class EthereumBlockchain(AlertSubmitter):
+    def __init__(self, provider_url="https://sepolia.infura.io/v3/1644a5b2aa5340d5b09b0b755f2cd4e3",
+                 chain_id=11155111):
+        from web3 import Web3
 
-class EthereumBlockchain:
-    def __init__(self):
         # Connect to Ethereum network (using Infura for this example)
         # You can replace this with your own Ethereum node URL or Infura project ID
-        self.w3 = Web3(Web3.HTTPProvider("https://sepolia.infura.io/v3/1644a5b2aa5340d5b09b0b755f2cd4e3"))
+        self.w3 = Web3(Web3.HTTPProvider(provider_url))
+        self.chain_id = chain_id
         
         # Check connection
         if not self.w3.is_connected():
@@ -80,6 +286,62 @@ class EthereumBlockchain:
         # Get account from private key
         self.account = self.w3.eth.account.from_key(self.private_key)
         print(f"Using account: {self.account.address}")
+        
+        # Local AlertMirror; once attached, alert history is read from it, not the node
+        self.mirror = None
+    
+    # Chain interface used by AlertSubmissionQueue
+    def get_nonce(self):
+        return self.w3.eth.get_transaction_count(self.account.address, 'pending')
+    
+    def gas_price(self):
+        return self.w3.eth.gas_price
+    
+    def estimate_gas(self, args):
+        return self.contract.functions.storeAlert(*args).estimate_gas({"from": self.account.address})
+    
+    def send_alert(self, args, nonce, gas, gas_price):
+        txn = self.contract.functions.storeAlert(*args).build_transaction({
+            'chainId': self.chain_id,
+            'gas': gas,
+            'gasPrice': gas_price,
+            'nonce': nonce,
+        })
+        signed_txn = self.w3.eth.account.sign_transaction(txn, private_key=self.private_key)
+        return self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    
+    def get_receipt(self, tx_hash):
+        try:
+            return self.w3.eth.get_transaction_receipt(to_hex(tx_hash))
+        except Exception as e:
+            if type(e).__name__ == "TransactionNotFound":
+                return None
+            raise
+    
+    # Read interface used by AlertMirror; every call is pinned to one block
+    def latest_block(self):
+        return self.w3.eth.block_number
+    
+    def fetch_alert_count(self, block):
+        return self.contract.functions.getAlertCount().call(block_identifier=block)
+    
+    def fetch_recent_alerts(self, block):
+        alerts = self.contract.functions.getRecentAlerts().call(block_identifier=block)
+        return [dict(zip(ALERT_FIELDS, alert)) for alert in alerts]
+    
+    def fetch_alert(self, alert_id, block):
+        # getAlert omits the id and type; only deforested areas are ever stored
+        latitude, longitude, deforestation, timestamp = self.contract.functions.getAlert(alert_id).call(
+            block_identifier=block
+        )
+        return {
+            "id": alert_id,
+            "alertType": "DEFORESTED" if deforestation else "FOREST",
+            "timestamp": timestamp,
+            "latitude": latitude,
+            "longitude": longitude,
+            "deforestation": deforestation
+        }
     
     def store_deforestation_alert(self, latitude, longitude, deforestation_score):
         """
@@ -123,7 +385,7 @@ class EthereumBlockchain:
                 lon_str,
                 is_deforestation
             ).build_transaction({
-                'chainId': 11155111,  # Sepolia chain ID
+                'chainId': self.chain_id,  # Sepolia chain ID by default
                 'gas': int(gas_estimate * 1.2),
                 'gasPrice': self.w3.eth.gas_price,
                 'nonce': nonce,
@@ -136,7 +398,7 @@ class EthereumBlockchain:
             
             return {
                 "status": "success",
-                "transaction_hash": receipt.transactionHash.hex(),
+                "transaction_hash": to_hex(receipt.transactionHash),
                 "block_number": receipt.blockNumber,
                 "gas_used": receipt.gasUsed,
                 "timestamp": int(time.time())
@@ -146,16 +408,21 @@ class EthereumBlockchain:
             print(f"Error storing alert in blockchain: {str(e)}")
             return {"status": "error", "message": str(e)}
     
-    def get_recent_alerts(self):
-        """Get the most recent alerts from the blockchain"""
+    def get_recent_alerts(self, limit=10):
+        """Get the most recent alerts, as dicts with the ALERT_FIELDS keys"""
+        if self.mirror is not None:
+            return self.mirror.query(limit=limit)
         try:
-            return self.contract.functions.getRecentAlerts().call()
+            alerts = self.contract.functions.getRecentAlerts().call()
+            return [dict(zip(ALERT_FIELDS, alert)) for alert in alerts][::-1][:limit]
         except Exception as e:
             print(f"Error getting recent alerts: {str(e)}")
             return []
     
     def get_alert_count(self):
         """Get the total number of alerts stored"""
+        if self.mirror is not None:
+            return self.mirror.count()
         try:
             return self.contract.functions.getAlertCount().call()
         except Exception as e:
@@ -0,0 +1,120 @@
+import os
+import time
+import uuid
+import queue
+import tempfile
+import threading
+from collections import deque
+import cv2
+
+
+class EvidenceBuffer:
+    """
+    Bounded in-memory ring of recently analyzed frames, kept as small thumbnails.
+
+    Only frames flagged as evidence are JPEG-encoded, and that happens on a
+    background writer thread. The evidence folder is capped at max_bytes by
+    deleting the oldest files first.
+    """
+
+    def __init__(self, capacity=16, evidence_dir=None, max_bytes=500 * 1024 * 1024, jpeg_quality=90,
+                 thumbnail_width=320):
+        self.frames = deque(maxlen=capacity)
+        self.thumbnail_width = thumbnail_width
+        self.evidence_dir = evidence_dir or os.path.join(tempfile.gettempdir(), "forest_evidence")
+        self.max_bytes = max_bytes
+        self.jpeg_quality = jpeg_quality
+
+        self.lock = threading.Lock()
+        self.write_queue = queue.Queue()
+        self.writer = None
+        self.saved_count = 0
+        # Distinguishes this instance's files from other runs started in the same second
+        self.run_id = uuid.uuid4().hex[:8]
+
+        # Oldest-first list of (path, size) so eviction never has to rescan the folder
+        self.saved_files = deque()
+        self.total_bytes = 0
+        self.load_existing_evidence()
+
+    def load_existing_evidence(self):
+        """Account for evidence left over from previous runs"""
+        try:
+            os.makedirs(self.evidence_dir, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.evidence_dir):
+                if name.endswith('.jpg'):
+                    path = os.path.join(self.evidence_dir, name)
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, path, stat.st_size))
+            for _, path, size in sorted(entries):
+                self.saved_files.append((path, size))
+                self.total_bytes += size
+        except Exception as e:
+            print(f"Error scanning evidence folder: {str(e)}")
+
+    def add(self, frame, results):
+        """Keep a downscaled copy of an analyzed frame and its results in the ring"""
+        height, width = frame.shape[:2]
+        if width > self.thumbnail_width:
+            size = (self.thumbnail_width, max(1, height * self.thumbnail_width // width))
+            frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        with self.lock:
+            self.frames.append((frame, results))
+
+    def recent(self):
+        """Snapshot of the ring, oldest first"""
+        with self.lock:
+            return list(self.frames)
+
+    def save(self, frame, timestamp, prefix="evidence"):
+        """Queue a frame to be written as JPEG evidence and return its future path"""
+        with self.lock:
+            self.saved_count += 1
+            name = f"{prefix}_{time.strftime('%Y%m%d_%H%M%S', time.localtime(timestamp))}_{self.run_id}_{self.saved_count:06d}.jpg"
+
+            if self.writer is None or not self.writer.is_alive():
+                self.writer = threading.Thread(target=self.write_loop, daemon=True)
+                self.writer.start()
+
+        path = os.path.join(self.evidence_dir, name)
+        self.write_queue.put((path, frame))
+        return path
+
+    def write_loop(self):
+        """Background writer: encode, write, then enforce the disk budget"""
+        while True:
+            item = self.write_queue.get()
+            if item is None:
+                self.write_queue.task_done()
+                return
+            path, frame = item
+            try:
+                ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if ok:
+                    with open(path, 'wb') as f:
+                        f.write(encoded.tobytes())
+                    self.saved_files.append((path, len(encoded)))
+                    self.total_bytes += len(encoded)
+                    self.evict()
+            except Exception as e:
+                print(f"Error writing evidence frame {path}: {str(e)}")
+            finally:
+                self.write_queue.task_done()
+
+    def evict(self):
+        """Delete the oldest evidence until the folder fits in max_bytes"""
+        while self.total_bytes > self.max_bytes and len(self.saved_files) > 1:
+            path, size = self.saved_files.popleft()
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def close(self):
+        """Wait for queued evidence to be written and stop the writer"""
+        if self.writer is not None and self.writer.is_alive():
+            self.write_queue.put(None)
+            self.writer.join()
+        self.writer = None
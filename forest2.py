@@ -1,29 +1,45 @@
+import os
+import json
+import math
+from datetime import datetime, timezone
+import numpy as np
 import requests
+from mapped_arrays import write_mapped_files, open_mapped_array
 
-def get_forest_data():
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "forest_index")
+
+
+def get_forest_data(overpass_url=OVERPASS_URL, newer_than=None, timeout=60):
     """
     Fetches a list of forests in India with their respective latitude and longitude.
 
+    Args:
+        overpass_url: Overpass API endpoint
+        newer_than: Only return nodes changed after this ISO timestamp
+
     Returns:
-        list: A list of dictionaries containing forest names and coordinates.
-              Example: [{'name': 'Sundarbans', 'latitude': 21.9497, 'longitude': 89.1833}, ...]
+        list: A list of dictionaries containing forest names and coordinates, or None if
+              the request failed (an empty list means there really were no matches).
+              Example: [{'id': 1, 'name': 'Sundarbans', 'latitude': 21.9497, 'longitude': 89.1833}, ...]
     """
-    overpass_url = "https://overpass-api.de/api/interpreter"
-    query = """
+    newer = f'(newer:"{newer_than}")' if newer_than else ""
+    query = f"""
     [out:json];
     area["name"="India"]->.searchArea;
-    node["natural"="wood"](area.searchArea);
+    node["natural"="wood"](area.searchArea){newer};
     out body;
     """
-    
+
     try:
-        response = requests.get(overpass_url, params={'data': query}, timeout=60)
+        response = requests.get(overpass_url, params={'data': query}, timeout=timeout)
         response.raise_for_status()
         data = response.json()
-        
+
         # Process the data
         forests = [
             {
+                'id': element.get('id'),
                 'name': element.get('tags', {}).get('name', 'Unknown Forest'),
                 'latitude': element.get('lat'),
                 'longitude': element.get('lon')
@@ -33,16 +49,234 @@ def get_forest_data():
 
         return forests  # Returning data as a fruitful function result
 
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, ValueError, KeyError) as e:
         print(f"Error: {e}")
-        return []  # Return empty list on error
+        return None  # Distinguishes a failed fetch from an empty result
+
+
+class ForestIndex:
+    """
+    Grid spatial index of forest nodes, stored as .npy arrays and memory-mapped on open.
+
+    Points are sorted by grid cell so every cell is a contiguous slice:
+        ids.npy        int64   (N,)    OSM node ids
+        coords.npy     float64 (N, 2)  (latitude, longitude)
+        cell_start.npy int64   (rows * cols + 1,) offsets into coords per cell
+        names.json     forest names in the same order
+        meta.json      grid origin, cell size, shape and last refresh time
+    Nothing touches the network until refresh() is called.
+    """
+
+    def __init__(self, index_dir=DEFAULT_INDEX_DIR, cell_size=0.25):
+        self.index_dir = index_dir
+        self.cell_size = cell_size
+        self.ids = np.empty(0, dtype=np.int64)
+        self.coords = np.empty((0, 2), dtype=np.float64)
+        self.cell_start = np.zeros(1, dtype=np.int64)
+        self.names = None
+        self.meta = {"origin": [0.0, 0.0], "cell_size": cell_size, "shape": [0, 0], "refreshed_at": None}
+        self.open()
+
+    def __len__(self):
+        return len(self.coords)
+
+    def path(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def open(self):
+        """Memory-map an existing index; leaves the index empty if there is none yet"""
+        try:
+            if not os.path.exists(self.path("meta.json")):
+                return
+            with open(self.path("meta.json")) as f:
+                self.meta = json.load(f)
+            self.cell_size = self.meta["cell_size"]
+            self.ids = open_mapped_array(self.index_dir, "ids.npy")
+            self.coords = open_mapped_array(self.index_dir, "coords.npy")
+            self.cell_start = open_mapped_array(self.index_dir, "cell_start.npy")
+            self.names = None  # Loaded on first name lookup
+        except Exception as e:
+            print(f"Error opening forest index: {str(e)}")
+
+    def name(self, i):
+        if self.names is None:
+            with open(self.path("names.json")) as f:
+                self.names = json.load(f)
+        return self.names[i]
+
+    def build(self, forests, refreshed_at=None):
+        """Write a new index from forest dicts (as returned by get_forest_data) and reopen it"""
+        # Last write wins per OSM id
+        unique = {}
+        for forest in forests:
+            key = forest.get('id')
+            if key is None:
+                key = (forest['latitude'], forest['longitude'])
+            unique[key] = forest
+        forests = list(unique.values())
+
+        ids = np.array([f.get('id') or -1 for f in forests], dtype=np.int64)
+        coords = np.array([[f['latitude'], f['longitude']] for f in forests], dtype=np.float64).reshape(-1, 2)
+        names = [f.get('name', 'Unknown Forest') for f in forests]
+
+        if len(coords):
+            origin = np.floor(coords.min(axis=0) / self.cell_size) * self.cell_size
+            shape = (np.floor((coords.max(axis=0) - origin) / self.cell_size).astype(np.int64) + 1)
+        else:
+            origin = np.zeros(2)
+            shape = np.zeros(2, dtype=np.int64)
+
+        cells = self.cells_of(coords, origin, shape)
+        order = np.argsort(cells, kind='stable')
+        counts = np.bincount(cells, minlength=int(shape[0] * shape[1]))
+        cell_start = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        self.ids = self.coords = self.cell_start = None  # Drop the old memory maps
+        write_mapped_files(
+            self.index_dir,
+            {"ids.npy": ids[order], "coords.npy": coords[order], "cell_start.npy": cell_start},
+            {"names.json": [names[i] for i in order],
+             "meta.json": {
+                 "origin": origin.tolist(),
+                 "cell_size": self.cell_size,
+                 "shape": [int(shape[0]), int(shape[1])],
+                 "refreshed_at": refreshed_at
+             }}
+        )
+        self.open()
+
+    def cells_of(self, coords, origin, shape):
+        """Flat cell number of each (lat, lon) row"""
+        rows_cols = np.floor((coords - origin) / self.cell_size).astype(np.int64)
+        rows_cols = np.clip(rows_cols, 0, np.maximum(np.asarray(shape) - 1, 0))
+        return rows_cols[:, 0] * shape[1] + rows_cols[:, 1]
+
+    def refresh(self, overpass_url=OVERPASS_URL):
+        """
+        Fetch nodes changed since the last refresh and merge them into the index.
+
+        Returns the number of changed nodes, or None if the fetch failed; a failed
+        fetch leaves the index and its refresh time untouched, so the next refresh
+        retries the same range (the full dataset if there never was a refresh).
+        """
+        started = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        changed = get_forest_data(overpass_url, newer_than=self.meta.get("refreshed_at"))
+        if changed is None:
+            return None
+        if not changed and self.meta.get("refreshed_at"):
+            return 0
+
+        existing = [
+            {'id': int(self.ids[i]), 'name': self.name(i),
+             'latitude': float(self.coords[i, 0]), 'longitude': float(self.coords[i, 1])}
+            for i in range(len(self))
+        ]
+        self.build(existing + changed, refreshed_at=started)
+        return len(changed)
+
+    def cell_slice(self, row, col):
+        rows, cols = self.meta["shape"]
+        if not (0 <= row < rows and 0 <= col < cols):
+            return slice(0, 0)
+        cell = row * cols + col
+        return slice(int(self.cell_start[cell]), int(self.cell_start[cell + 1]))
+
+    def ring_cells(self, row, col, ring):
+        """Flat numbers of the grid cells exactly ring cells (Chebyshev) from (row, col)"""
+        rows, cols = self.meta["shape"]
+        if ring == 0:
+            return np.array([row * cols + col], dtype=np.int64)
+        r0, r1, c0, c1 = row - ring, row + ring, col - ring, col + ring
+        ring_rows = np.arange(max(0, r0), min(rows - 1, r1) + 1)
+        ring_cols = np.arange(max(0, c0), min(cols - 1, c1) + 1)
+        inner_rows = ring_rows[(ring_rows != r0) & (ring_rows != r1)]
+        parts = [r * cols + ring_cols for r in (r0, r1) if 0 <= r < rows]
+        parts += [inner_rows * cols + c for c in (c0, c1) if 0 <= c < cols]
+        return np.concatenate(parts).astype(np.int64) if parts else np.empty(0, dtype=np.int64)
+
+    def gather(self, cells):
+        """Indices into coords of every point in the given cells, in one vectorized step"""
+        starts = np.asarray(self.cell_start[cells], dtype=np.int64)
+        lengths = np.asarray(self.cell_start[cells + 1], dtype=np.int64) - starts
+        total = int(lengths.sum())
+        if not total:
+            return np.empty(0, dtype=np.int64)
+        # Each point's index is its cell's start plus its offset inside that cell
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(total)
+
+    def nearest(self, latitude, longitude):
+        """Closest forest as (name, latitude, longitude, distance_km), or None if the index is empty"""
+        if not len(self) or not (math.isfinite(latitude) and math.isfinite(longitude)):
+            return None
+
+        rows, cols = self.meta["shape"]
+        origin_lat, origin_lon = self.meta["origin"]
+        # Start from the grid cell closest to the point. For a point outside the grid every
+        # cell is at least as far away as from that edge cell, so nothing closer is skipped
+        row = min(max(int(math.floor((latitude - origin_lat) / self.cell_size)), 0), rows - 1)
+        col = min(max(int(math.floor((longitude - origin_lon) / self.cell_size)), 0), cols - 1)
+
+        # Search rings of cells outward until the ring is farther than the best hit
+        lon_scale = math.cos(math.radians(latitude))
+        best, best_dist = None, float('inf')
+        max_ring = max(row, rows - 1 - row, col, cols - 1 - col)
+        for ring in range(max_ring + 1):
+            if best is not None and (ring - 1) * self.cell_size * lon_scale > best_dist:
+                break
+            candidates = self.gather(self.ring_cells(row, col, ring))
+            if not len(candidates):
+                continue
+            points = self.coords[candidates]
+            dist = np.hypot(points[:, 0] - latitude, (points[:, 1] - longitude) * lon_scale)
+            i = int(np.argmin(dist))
+            if dist[i] < best_dist:
+                best, best_dist = int(candidates[i]), float(dist[i])
+
+        lat, lon = self.coords[best]
+        return self.name(best), float(lat), float(lon), haversine_km(latitude, longitude, lat, lon)
+
+    def within_bbox(self, min_lat, min_lon, max_lat, max_lon):
+        """(N, 2) array of (latitude, longitude) for forests inside the box"""
+        if not len(self):
+            return np.empty((0, 2))
+
+        origin_lat, origin_lon = self.meta["origin"]
+        row0 = int(math.floor((min_lat - origin_lat) / self.cell_size))
+        row1 = int(math.floor((max_lat - origin_lat) / self.cell_size))
+        col0 = max(0, int(math.floor((min_lon - origin_lon) / self.cell_size)))
+        col1 = min(self.meta["shape"][1] - 1, int(math.floor((max_lon - origin_lon) / self.cell_size)))
+
+        # Each grid row is contiguous from col0 to col1, so take it as one slice
+        parts = []
+        for row in range(max(0, row0), min(self.meta["shape"][0] - 1, row1) + 1):
+            if col1 < col0:
+                break
+            start = self.cell_slice(row, col0).start
+            stop = self.cell_slice(row, col1).stop
+            parts.append(self.coords[start:stop])
+        if not parts:
+            return np.empty((0, 2))
+
+        points = np.concatenate(parts)
+        inside = ((points[:, 0] >= min_lat) & (points[:, 0] <= max_lat) &
+                  (points[:, 1] >= min_lon) & (points[:, 1] <= max_lon))
+        return points[inside]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * math.asin(math.sqrt(a))
+
 
 # Example Usage
-forest_data = get_forest_data()
-
-if forest_data:
-    print("Forests in India with Coordinates:")
-    for idx, forest in enumerate(forest_data, 1):
-        print(f"{idx}. {forest['name']} - Lat: {forest['latitude']}, Lon: {forest['longitude']}")
-else:
-    print("No forest data found.")
+if __name__ == "__main__":
+    forest_data = get_forest_data()
+
+    if forest_data:
+        print("Forests in India with Coordinates:")
+        for idx, forest in enumerate(forest_data, 1):
+            print(f"{idx}. {forest['name']} - Lat: {forest['latitude']}, Lon: {forest['longitude']}")
+    else:
+        print("No forest data found.")
@@ -0,0 +1,100 @@
+import threading
+import numpy as np
+import cv2
+
+
+class FramePreprocessor:
+    """
+    Turns BGR frames into the (N, 224, 224, 3) float32 tensor the poaching model expects.
+
+    All intermediate and output arrays are allocated once and reused, so steady-state
+    calls do not touch the heap. The returned array is a view into the internal
+    buffer and is overwritten by the next call; pass it to the model before then.
+    One instance must not be shared between threads.
+    """
+
+    def __init__(self, size=(224, 224), max_batch=16):
+        self.size = size
+        width, height = size
+        self.resized = np.empty((height, width, 3), dtype=np.uint8)
+        self.output = np.empty((max_batch, height, width, 3), dtype=np.float32)
+        self.scale = np.float32(1.0 / 255.0)
+
+    def ensure_capacity(self, batch_size):
+        """Grow the output buffer if a batch larger than any before arrives"""
+        if batch_size > len(self.output):
+            self.output = np.empty((batch_size,) + self.output.shape[1:], dtype=np.float32)
+
+    def process(self, frames):
+        """Preprocess a list of frames or an (N, H, W, 3) array into the reused output buffer"""
+        count = len(frames)
+        self.ensure_capacity(count)
+
+        for i in range(count):
+            # Resize and convert colour inside the same preallocated uint8 buffer
+            cv2.resize(frames[i], self.size, dst=self.resized)
+            cv2.cvtColor(self.resized, cv2.COLOR_BGR2RGB, dst=self.resized)
+
+            # Scale to [0, 1] straight into this frame's slot of the output tensor
+            np.multiply(self.resized, self.scale, out=self.output[i], casting='unsafe')
+
+        return self.output[:count]
+
+
+class DisplayFramePool:
+    """
+    Fixed set of RGB buffers already scaled to the video widget's size.
+
+    The worker fills a free buffer and hands it to the GUI thread, which gives it
+    back with release() once Qt has copied the pixels. When every buffer is still
+    in use the GUI is behind, and acquire() returns None so the frame can be skipped.
+    Several worker threads may acquire from one pool at once.
+    """
+
+    def __init__(self, count=3):
+        self.count = count
+        self.target = None  # (width, height) of the display area
+        self.shape = None
+        self.free = []
+        self.lock = threading.Lock()
+
+    def set_target(self, width, height):
+        """Called from the GUI thread whenever the display area changes size"""
+        with self.lock:
+            self.target = (max(1, int(width)), max(1, int(height)))
+            self.shape = None  # Buffers are rebuilt on the next acquire
+
+    def fit(self, frame_width, frame_height):
+        """Largest size with the frame's aspect ratio that fits the target"""
+        target_width, target_height = self.target
+        scale = min(target_width / frame_width, target_height / frame_height)
+        return max(1, int(frame_width * scale)), max(1, int(frame_height * scale))
+
+    def acquire(self, frame):
+        """Scale and colour-convert a BGR frame into a free buffer, or None if none is free"""
+        with self.lock:
+            if self.target is None:
+                return None
+
+            height, width = frame.shape[:2]
+            out_width, out_height = self.fit(width, height)
+            shape = (out_height, out_width, 3)
+            if shape != self.shape:
+                self.shape = shape
+                self.free = [np.empty(shape, dtype=np.uint8) for _ in range(self.count)]
+
+            if not self.free:
+                return None
+            buffer = self.free.pop()
+
+        # Both steps write only this caller's buffer, so no lock is needed for them
+        cv2.resize(frame, (out_width, out_height), dst=buffer, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(buffer, cv2.COLOR_BGR2RGB, dst=buffer)
+        return buffer
+
+    def release(self, buffer):
+        """Return a buffer once the GUI is done with it"""
+        with self.lock:
+            # Buffers from before a resize are simply dropped
+            if buffer.shape == self.shape and len(self.free) < self.count:
+                self.free.append(buffer)
@@ -0,0 +1,195 @@
+import os
+import sys
+import json
+import math
+import argparse
+import numpy as np
+from mapped_arrays import write_mapped_files, open_mapped_array
+
+DEFAULT_HISTORY_DIR = os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "history_grid")
+
+
+class HistoryGrid:
+    """
+    Yearly forest-loss percentages on a regular lat/lon grid, memory-mapped from disk.
+
+        loss.npy   float32 (rows, cols, years)  loss percent per cell and year, NaN = no data
+        meta.json  grid origin (south-west corner), cell size, first year
+    A lookup is two floor divisions and one index into the mapped array, so nothing
+    is read from disk beyond the page holding that cell.
+    """
+
+    def __init__(self, grid_dir=DEFAULT_HISTORY_DIR):
+        self.grid_dir = grid_dir
+        self.loss = np.empty((0, 0, 0), dtype=np.float32)
+        self.meta = {"origin": [0.0, 0.0], "cell_size": 1.0, "first_year": 0}
+        self.open()
+
+    def __len__(self):
+        return self.loss.shape[0] * self.loss.shape[1]
+
+    def path(self, name):
+        return os.path.join(self.grid_dir, name)
+
+    def open(self):
+        """Memory-map an existing grid; leaves the grid empty if there is none yet"""
+        try:
+            if not os.path.exists(self.path("meta.json")):
+                return
+            with open(self.path("meta.json")) as f:
+                self.meta = json.load(f)
+            self.loss = open_mapped_array(self.grid_dir, "loss.npy")
+        except Exception as e:
+            print(f"Error opening history grid: {str(e)}")
+
+    @property
+    def years(self):
+        first_year = self.meta["first_year"]
+        return list(range(first_year, first_year + self.loss.shape[2]))
+
+    def cell_of(self, latitude, longitude):
+        """(row, col) of the cell containing the point, or None outside the grid"""
+        # math.floor raises on NaN and infinity; such points are simply not in the grid
+        if not (math.isfinite(latitude) and math.isfinite(longitude)):
+            return None
+        origin_lat, origin_lon = self.meta["origin"]
+        row = math.floor((latitude - origin_lat) / self.meta["cell_size"])
+        col = math.floor((longitude - origin_lon) / self.meta["cell_size"])
+        if 0 <= row < self.loss.shape[0] and 0 <= col < self.loss.shape[1]:
+            return row, col
+        return None
+
+    def lookup(self, latitude, longitude):
+        """Loss percent per year (float32 array, NaN = no data), or None outside the grid"""
+        cell = self.cell_of(latitude, longitude)
+        if cell is None:
+            return None
+        return self.loss[cell]
+
+    def year_slice(self, start_year=None, end_year=None):
+        """Slice of the year axis covering start_year..end_year inclusive (clipped to the grid)"""
+        first_year, count = self.meta["first_year"], self.loss.shape[2]
+        start = 0 if start_year is None else min(max(start_year - first_year, 0), count)
+        stop = count if end_year is None else min(max(end_year - first_year + 1, start), count)
+        return slice(start, stop)
+
+    def lookup_many(self, latitudes, longitudes, start_year=None, end_year=None):
+        """
+        Loss percent for many points at once, as a float32 (N, years) array.
+
+        Rows for points outside the grid are all NaN. The years covered are
+        self.years[self.year_slice(start_year, end_year)].
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64).ravel()
+        longitudes = np.asarray(longitudes, dtype=np.float64).ravel()
+        years = self.year_slice(start_year, end_year)
+        result = np.full((len(latitudes), years.stop - years.start), np.nan, dtype=np.float32)
+        if not len(self) or not result.size:
+            return result
+
+        origin_lat, origin_lon = self.meta["origin"]
+        # NaN coordinates cast to arbitrary indices; the finite mask below drops them
+        with np.errstate(invalid='ignore'):
+            rows = np.floor((latitudes - origin_lat) / self.meta["cell_size"]).astype(np.intp)
+            cols = np.floor((longitudes - origin_lon) / self.meta["cell_size"]).astype(np.intp)
+        inside = np.isfinite(latitudes) & np.isfinite(longitudes) & (rows >= 0) & (rows < self.loss.shape[0]) & (cols >= 0) & (cols < self.loss.shape[1])
+
+        # One fancy-indexing gather from the memory map, no per-point Python work
+        if inside.all():
+            result[:] = self.loss[rows, cols, years]
+        elif inside.any():
+            result[inside] = self.loss[rows[inside], cols[inside], years]
+        return result
+
+    def build(self, loss, origin, cell_size, first_year):
+        """Write a new grid from a (rows, cols, years) array and reopen it"""
+        self.loss = np.empty((0, 0, 0), dtype=np.float32)  # Drop the old memory map
+        write_mapped_files(
+            self.grid_dir,
+            {"loss.npy": np.ascontiguousarray(loss, dtype=np.float32)},
+            {"meta.json": {
+                "origin": [float(origin[0]), float(origin[1])],
+                "cell_size": float(cell_size),
+                "first_year": int(first_year)
+            }}
+        )
+        self.open()
+
+    def import_csv(self, csv_path, cell_size=0.05):
+        """
+        Build the grid from a CSV with latitude, longitude, year and loss_percent columns.
+
+        Rows falling in the same cell and year are averaged. Returns the number of rows read.
+        """
+        table = np.genfromtxt(csv_path, delimiter=',', names=True, dtype=np.float64)
+        table = np.atleast_1d(table)
+        coords = np.column_stack([table['latitude'], table['longitude']])
+        years = table['year'].astype(np.int64)
+        values = table['loss_percent']
+
+        origin = np.floor(coords.min(axis=0) / cell_size) * cell_size
+        rows_cols = np.floor((coords - origin) / cell_size).astype(np.int64)
+        shape = rows_cols.max(axis=0) + 1
+        first_year = int(years.min())
+        year_index = years - first_year
+
+        total = np.zeros((shape[0], shape[1], year_index.max() + 1), dtype=np.float64)
+        count = np.zeros_like(total)
+        index = (rows_cols[:, 0], rows_cols[:, 1], year_index)
+        np.add.at(total, index, values)
+        np.add.at(count, index, 1)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            loss = np.where(count > 0, total / count, np.nan)
+        self.build(loss, origin, cell_size, first_year)
+        return len(values)
+
+    def import_raster(self, raster_paths, first_year):
+        """
+        Build the grid from one single-band, north-up GeoTIFF per year (needs rasterio).
+
+        All rasters must share the same extent and resolution. Returns the grid shape.
+        """
+        import rasterio
+
+        bands = []
+        transform = nodata = None
+        for raster_path in raster_paths:
+            with rasterio.open(raster_path) as src:
+                transform, nodata = src.transform, src.nodata
+                band = src.read(1).astype(np.float32)
+            if nodata is not None:
+                band[band == nodata] = np.nan
+            bands.append(band[::-1])  # Raster rows run north to south, grid rows south to north
+
+        loss = np.stack(bands, axis=-1)
+        cell_size = transform.a
+        origin = (transform.f + transform.e * loss.shape[0], transform.c)
+        self.build(loss, origin, cell_size, first_year)
+        return loss.shape
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the historical deforestation grid")
+    parser.add_argument("--grid-dir", default=DEFAULT_HISTORY_DIR)
+    subparsers = parser.add_subparsers(dest="source", required=True)
+
+    csv_parser = subparsers.add_parser("csv", help="latitude,longitude,year,loss_percent rows")
+    csv_parser.add_argument("csv_path")
+    csv_parser.add_argument("--cell-size", type=float, default=0.05)
+
+    raster_parser = subparsers.add_parser("raster", help="One GeoTIFF per year, oldest first")
+    raster_parser.add_argument("raster_paths", nargs="+")
+    raster_parser.add_argument("--first-year", type=int, required=True)
+
+    args = parser.parse_args()
+
+    grid = HistoryGrid(args.grid_dir)
+    if args.source == "csv":
+        rows = grid.import_csv(args.csv_path, args.cell_size)
+        print(f"Imported {rows} rows")
+    elif args.source == "raster":
+        grid.import_raster(args.raster_paths, args.first_year)
+    print(f"Grid {grid.loss.shape[0]} x {grid.loss.shape[1]} cells, years {grid.years[0]}-{grid.years[-1]}"
+          if len(grid) else "Grid is empty")
+    sys.exit(0)
@@ -0,0 +1,24 @@
+import os
+import json
+import numpy as np
+
+
+def write_mapped_files(directory, arrays, json_files):
+    """
+    Write arrays as .npy files and small metadata as JSON, in the order given.
+
+    The arrays are meant to be reopened with open_mapped_array. Callers must drop
+    their own memory maps of these files first: a mapped file cannot be replaced on
+    Windows. Write the file whose presence marks a complete set (meta.json) last.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, name), array)
+    for name, value in json_files.items():
+        with open(os.path.join(directory, name), 'w') as f:
+            json.dump(value, f)
+
+
+def open_mapped_array(directory, name):
+    """Read-only memory map of an .npy file; only the pages that are touched are read"""
+    return np.load(os.path.join(directory, name), mmap_mode='r')
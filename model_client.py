@@ -0,0 +1,84 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class ModelClient(QObject):
+    """
+    Non-blocking client for the deforestation model API.
+
+    Requests run on a small worker pool over one keep-alive session, and at most
+    max_in_flight of them are outstanding at once. Results come back through Qt
+    signals, so slots run on the GUI thread.
+    """
+    result_ready = pyqtSignal(dict)
+    request_failed = pyqtSignal(str, str)  # (title, message)
+
+    def __init__(self, base_url="http://127.0.0.1:8000", max_in_flight=2, timeout=10, parent=None):
+        super().__init__(parent)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+        # Reuse TCP connections to the API between requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="model-client")
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def predict(self, image_bytes, latitude, longitude, filename='image.jpg', content_type='image/jpeg'):
+        """Queue a /predict request. Returns False if max_in_flight requests are already running"""
+        if not self.in_flight.acquire(blocking=False):
+            return False
+        self.executor.submit(self.post_predict, image_bytes, latitude, longitude, filename, content_type)
+        return True
+
+    def post_predict(self, image_bytes, latitude, longitude, filename, content_type):
+        url = f"{self.base_url}/predict"
+        try:
+            files = {'file': (filename, image_bytes, content_type)}
+            data = {
+                'latitude': str(latitude),
+                'longitude': str(longitude)
+            }
+            response = self.session.post(url, files=files, data=data, timeout=self.timeout)
+
+            try:
+                result = response.json()
+            except ValueError:
+                print(f"Invalid JSON response: {response.text}")
+                self.request_failed.emit("Server Error",
+                                         f"Server returned invalid data. Response: {response.text[:200]}")
+                return
+
+            if response.status_code != 200:
+                error_msg = result.get('detail', response.text) if isinstance(result, dict) else response.text
+                print(f"Server error {response.status_code}: {error_msg}")
+                self.request_failed.emit("Server Error", f"Server error {response.status_code}: {error_msg}")
+                return
+
+            if not isinstance(result, dict):
+                raise ValueError(f"Expected dictionary response, got {type(result)}")
+
+            # Keep the location the capture was taken at, even if the camera has moved since
+            result.setdefault('latitude', latitude)
+            result.setdefault('longitude', longitude)
+            self.result_ready.emit(result)
+
+        except requests.exceptions.ConnectionError:
+            print(f"Connection error: API server not running at {url}")
+            self.request_failed.emit("Connection Error",
+                                     f"Could not connect to the model API at {url}. Make sure the server is running.")
+        except Exception as e:
+            print(f"Error sending to model: {str(e)}")
+            self.request_failed.emit("Analysis Error", f"Error during analysis: {str(e)}")
+        finally:
+            self.in_flight.release()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
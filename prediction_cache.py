@@ -0,0 +1,120 @@
+import os
+import json
+import math
+import time
+import threading
+from collections import OrderedDict
+
+
+def difference_hash(rows):
+    """
+    64-bit perceptual hash (dHash) of an 8x9 grid of grayscale values.
+
+    Each bit records whether a pixel is brighter than its right neighbour, so small
+    changes in compression or lighting leave the hash (nearly) unchanged.
+    """
+    value = 0
+    for row in rows:
+        for left, right in zip(row, row[1:]):
+            value = (value << 1) | (1 if left > right else 0)
+    return value
+
+
+class PredictionCache:
+    """
+    LRU + TTL cache of model predictions for map viewports, persisted as JSON.
+
+    A viewport is identified by its quantized latitude/longitude, a camera height
+    bucket and the perceptual hash of the capture. Captures whose hashes differ in at
+    most max_hash_distance bits count as the same view.
+    """
+
+    def __init__(self, path, max_entries=256, ttl=24 * 3600, precision=3, max_hash_distance=4):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.precision = precision
+        self.max_hash_distance = max_hash_distance
+
+        self.entries = OrderedDict()  # cell key -> list of [hash, stored_at, result]; LRU order
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def cell_key(self, latitude, longitude, height):
+        """Quantized location plus a log2 bucket of camera height"""
+        height_bucket = int(math.log2(max(float(height), 1.0)))
+        return f"{round(float(latitude), self.precision)}:{round(float(longitude), self.precision)}:{height_bucket}"
+
+    def get(self, latitude, longitude, height, image_hash):
+        """Cached prediction for this view, or None"""
+        key = self.cell_key(latitude, longitude, height)
+        now = time.time()
+        with self.lock:
+            candidates = self.entries.get(key, [])
+            candidates[:] = [entry for entry in candidates if now - entry[1] < self.ttl]
+            for entry in candidates:
+                if bin(entry[0] ^ image_hash).count("1") <= self.max_hash_distance:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(entry[2])
+            if key in self.entries and not candidates:
+                del self.entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, latitude, longitude, height, image_hash, result):
+        """Store a prediction, evicting the least recently used views beyond max_entries"""
+        key = self.cell_key(latitude, longitude, height)
+        with self.lock:
+            candidates = self.entries.setdefault(key, [])
+            candidates[:] = [entry for entry in candidates
+                             if bin(entry[0] ^ image_hash).count("1") > self.max_hash_distance]
+            candidates.append([image_hash, time.time(), result])
+            self.entries.move_to_end(key)
+
+            while sum(len(v) for v in self.entries.values()) > self.max_entries:
+                oldest_key, oldest = next(iter(self.entries.items()))
+                oldest.pop(0)
+                if not oldest:
+                    del self.entries[oldest_key]
+        self.save()
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": sum(len(v) for v in self.entries.values())
+            }
+
+    def load(self):
+        """Restore unexpired entries saved by a previous session"""
+        try:
+            if not os.path.exists(self.path):
+                return
+            with open(self.path) as f:
+                saved = json.load(f)
+            now = time.time()
+            for key, candidates in saved:
+                fresh = [entry for entry in candidates if now - entry[1] < self.ttl]
+                if fresh:
+                    self.entries[key] = fresh
+        except Exception as e:
+            print(f"Error loading prediction cache: {str(e)}")
+
+    def save(self):
+        """Write the cache atomically so a crash never leaves a truncated file"""
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with self.lock:
+                snapshot = [[key, candidates] for key, candidates in self.entries.items()]
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"Error saving prediction cache: {str(e)}")
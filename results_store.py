@@ -0,0 +1,197 @@
+import csv
+import json
+import math
+import queue
+import sqlite3
+import threading
+from sqlite_wal import open_wal_database
+
+
+class ResultsStore:
+    """
+    Append-only store of analysis results in SQLite (WAL mode), replacing per-run text files.
+
+    Each result is indexed by its grid cell (cell_size degrees) and timestamp, so
+    bounding-box and time-range queries read only matching rows. record() only
+    enqueues; a writer thread inserts queued results in batches, one transaction
+    per batch, so the GUI thread never waits on disk.
+    """
+
+    def __init__(self, path, cell_size=0.1, batch_size=64, flush_interval=1.0):
+        self.path = path
+        self.cell_size = cell_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.lock = threading.Lock()
+        self.db = open_wal_database(path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                latitude REAL NOT NULL,
+                longitude REAL NOT NULL,
+                cell_row INTEGER NOT NULL,
+                cell_col INTEGER NOT NULL,
+                deforestation_score REAL NOT NULL,
+                classification TEXT,
+                confidence REAL,
+                historical_data TEXT
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS analyses_cell ON analyses (cell_row, cell_col, timestamp)")
+        self.db.execute("CREATE INDEX IF NOT EXISTS analyses_time ON analyses (timestamp)")
+
+        self.pending = queue.Queue()
+        self.running = True
+        self.writer = threading.Thread(target=self.write_loop, daemon=True, name="results-writer")
+        self.writer.start()
+
+    def cell_of(self, latitude, longitude):
+        return math.floor(latitude / self.cell_size), math.floor(longitude / self.cell_size)
+
+    def record(self, result):
+        """
+        Queue one analysis result for writing
+
+        Args:
+            result: dict with timestamp, latitude, longitude, deforestation_score and
+                    optionally classification, confidence and historical_data
+        """
+        self.pending.put(result)
+
+    def write_loop(self):
+        while self.running or not self.pending.empty():
+            try:
+                batch = [self.pending.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self.write_batch(batch)
+            except Exception as e:
+                print(f"Error saving analysis results: {str(e)}")
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def write_batch(self, batch):
+        rows = []
+        for result in batch:
+            latitude, longitude = float(result['latitude']), float(result['longitude'])
+            rows.append((
+                float(result['timestamp']), latitude, longitude, *self.cell_of(latitude, longitude),
+                float(result['deforestation_score']),
+                result.get('classification'),
+                result.get('confidence'),
+                json.dumps(result.get('historical_data', []))
+            ))
+        with self.lock:
+            self.db.execute("BEGIN")
+            try:
+                self.db.executemany(
+                    "INSERT INTO analyses (timestamp, latitude, longitude, cell_row, cell_col, "
+                    "deforestation_score, classification, confidence, historical_data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self.db.execute("COMMIT")
+            except Exception:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def flush(self):
+        """Block until every queued result has been written"""
+        self.pending.join()
+
+    def select(self, bbox=None, start=None, end=None):
+        """SQL and parameters for analyses within bbox (min_lat, min_lon, max_lat, max_lon) and time range"""
+        clauses, params = [], []
+        if bbox is not None:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            row0, col0 = self.cell_of(min_lat, min_lon)
+            row1, col1 = self.cell_of(max_lat, max_lon)
+            # Cell ranges use the index; the exact test trims the edge cells
+            clauses.append("cell_row BETWEEN ? AND ? AND cell_col BETWEEN ? AND ?")
+            params += [row0, row1, col0, col1]
+            clauses.append("latitude BETWEEN ? AND ? AND longitude BETWEEN ? AND ?")
+            params += [min_lat, max_lat, min_lon, max_lon]
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp <= ?")
+            params.append(end)
+
+        sql = ("SELECT id, timestamp, latitude, longitude, deforestation_score, classification, "
+               "confidence, historical_data FROM analyses")
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql + " ORDER BY timestamp", params
+
+    def query(self, bbox=None, start=None, end=None, limit=None):
+        """All analyses within the bounding box and time range (inclusive), oldest first"""
+        sql, params = self.select(bbox, start, end)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [self.as_dict(row) for row in rows]
+
+    def as_dict(self, row):
+        return {
+            "id": row[0],
+            "timestamp": row[1],
+            "latitude": row[2],
+            "longitude": row[3],
+            "deforestation_score": row[4],
+            "classification": row[5],
+            "confidence": row[6],
+            "historical_data": json.loads(row[7]) if row[7] else []
+        }
+
+    def export(self, out_path, bbox=None, start=None, end=None, batch_size=5000):
+        """
+        Write matching analyses to a .csv or .jsonl file, streaming in batches
+
+        Returns:
+            int: Number of analyses written
+        """
+        sql, params = self.select(bbox, start, end)
+        jsonl = out_path.lower().endswith(".jsonl")
+        written = 0
+        # A separate read connection, so a large export does not hold up the writer
+        reader = sqlite3.connect(self.path)
+        try:
+            cursor = reader.execute(sql, params)
+            with open(out_path, 'w', newline='') as f:
+                writer = None
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        result = self.as_dict(row)
+                        if jsonl:
+                            f.write(json.dumps(result) + "\n")
+                        else:
+                            if writer is None:
+                                writer = csv.DictWriter(f, fieldnames=list(result))
+                                writer.writeheader()
+                            result["historical_data"] = json.dumps(result["historical_data"])
+                            writer.writerow(result)
+                    written += len(rows)
+        finally:
+            reader.close()
+        return written
+
+    def close(self):
+        self.running = False
+        self.writer.join(timeout=5)
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,17 @@
+import os
+import sqlite3
+
+
+def open_wal_database(path):
+    """
+    SQLite connection in WAL mode, shared by the caller's threads behind its own lock.
+
+    Autocommit (isolation_level=None): callers issue BEGIN / COMMIT around their
+    batches. WAL lets readers run during a write, and synchronous=NORMAL skips the
+    fsync per commit while keeping the file consistent after a crash.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
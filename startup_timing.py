@@ -0,0 +1,54 @@
+import time
+import threading
+import importlib
+from contextlib import contextmanager
+
+# Reference point for time-to-interactive; set when this module is first imported
+PROCESS_START = time.perf_counter()
+
+
+class StartupTimer:
+    """Records how long each import and background service takes during startup"""
+
+    def __init__(self):
+        self.events = []  # (kind, name, start offset, duration, thread name)
+        self.marks = {}
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, kind, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.events.append((kind, name, start - PROCESS_START, end - start,
+                                    threading.current_thread().name))
+
+    def import_module(self, name):
+        """Import a module and record how long it took (near zero if already loaded)"""
+        with self.measure("import", name):
+            return importlib.import_module(name)
+
+    def mark(self, name):
+        """Record a milestone such as first paint, relative to process start"""
+        with self.lock:
+            self.marks.setdefault(name, time.perf_counter() - PROCESS_START)
+
+    def report(self):
+        """Human-readable timing table, slowest first"""
+        with self.lock:
+            events = sorted(self.events, key=lambda e: e[3], reverse=True)
+            marks = sorted(self.marks.items(), key=lambda m: m[1])
+
+        lines = ["Startup timing report:"]
+        for name, offset in marks:
+            lines.append(f"  {name:<32} at {offset * 1000:8.1f} ms")
+        for kind, name, start, duration, thread in events:
+            lines.append(f"  {kind:<8} {name:<23} {duration * 1000:8.1f} ms "
+                         f"(started at {start * 1000:.1f} ms on {thread})")
+        return "\n".join(lines)
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The application modules live flat at the repository root; test doubles in stubs.py here
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+sys.path.insert(0, TESTS_DIR)
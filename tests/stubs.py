@@ -0,0 +1,176 @@
+import json
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from ethereum_integration import ALERT_FIELDS, AlertSubmitter
+
+
+class JsonServer:
+    """
+    Local HTTP server on 127.0.0.1 answering every request with JSON from respond().
+
+    Subclasses implement respond(method, path, body) -> (status, payload). Use as a
+    context manager; base_url points at the bound port.
+    """
+
+    def __init__(self, port=0):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real servers
+
+            def reply(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                status, payload = stub.respond(self.command, self.path, self.headers, body)
+                payload = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = reply
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def respond(self, method, path, headers, body):
+        raise NotImplementedError
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubModelServer(JsonServer):
+    """Stand-in for the model API: a fixed JSON body for POST /predict, recording every request"""
+
+    def __init__(self, response=None, status=200, port=0):
+        super().__init__(port)
+        self.response = response if response is not None else {"deforestation_score": 0.5}
+        self.status = status
+        self.requests = []
+
+    def respond(self, method, path, headers, body):
+        self.requests.append({"path": path, "headers": dict(headers), "body": body})
+        return self.status, self.response
+
+
+class LocalOverpassServer(JsonServer):
+    """
+    Stand-in for the Overpass API, serving a fixed list of nodes.
+
+    Understands the (newer:"...") filter used by ForestIndex.refresh, based on
+    each node's 'timestamp'; url points at the interpreter.
+    """
+
+    def __init__(self, elements=None, port=0):
+        super().__init__(port)
+        self.elements = list(elements or [])
+        self.queries = []
+        self.url = self.base_url + "/api/interpreter"
+
+    def respond(self, method, path, headers, body):
+        query = parse_qs(path.partition('?')[2]).get('data', [''])[0]
+        self.queries.append(query)
+        elements = self.elements
+        if '(newer:"' in query:
+            newer = query.split('(newer:"', 1)[1].split('"', 1)[0]
+            elements = [e for e in elements if e.get('timestamp', '') > newer]
+        return 200, {"elements": elements}
+
+
+class LocalChain(AlertSubmitter):
+    """
+    In-process stand-in for the alert contract, for exercising AlertSubmissionQueue.
+
+    Enforces nonce order like a node, mines each transaction block_time seconds after
+    it is sent, and counts gas price / estimate lookups so caching can be checked.
+    """
+
+    def __init__(self, block_time=0.05, gas_price_wei=10 ** 9, gas_estimate=90000):
+        self.block_time = block_time
+        self.gas_price_wei = gas_price_wei
+        self.gas_estimate = gas_estimate
+        self.lock = threading.Lock()
+        self.next_nonce = 0
+        self.block_number = 0
+        self.transactions = {}  # tx_hash -> {"sent_at", "args", "block"}
+        self.alerts = []
+        self.gas_price_calls = 0
+        self.estimate_calls = 0
+
+    def get_nonce(self):
+        with self.lock:
+            return self.next_nonce
+
+    def gas_price(self):
+        self.gas_price_calls += 1
+        return self.gas_price_wei
+
+    def estimate_gas(self, args):
+        self.estimate_calls += 1
+        return self.gas_estimate
+
+    def send_alert(self, args, nonce, gas, gas_price):
+        with self.lock:
+            if nonce != self.next_nonce:
+                raise ValueError(f"nonce too low: expected {self.next_nonce}, got {nonce}")
+            self.next_nonce += 1
+            tx_hash = hashlib.sha256(f"{nonce}:{args}".encode()).digest()
+            self.transactions[tx_hash] = {"sent_at": time.time(), "args": args, "block": None}
+            return tx_hash
+
+    def get_receipt(self, tx_hash):
+        if isinstance(tx_hash, str):
+            tx_hash = bytes.fromhex(tx_hash[2:] if tx_hash.startswith("0x") else tx_hash)
+        with self.lock:
+            tx = self.transactions.get(tx_hash)
+            if tx is None:
+                return None  # Unknown to the node, like a dropped transaction
+            if tx["block"] is None:
+                if time.time() - tx["sent_at"] < self.block_time:
+                    return None
+                # Mine it: one block per transaction
+                self.block_number += 1
+                tx["block"] = self.block_number
+                alert_type, latitude, longitude, deforestation = tx["args"]
+                self.alerts.append({
+                    "id": len(self.alerts),
+                    "alertType": alert_type,
+                    "timestamp": int(time.time()),
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "deforestation": deforestation,
+                    "block": self.block_number
+                })
+            return {"transactionHash": tx_hash, "blockNumber": tx["block"], "gasUsed": self.gas_estimate}
+
+    # Read interface used by AlertMirror; the contract only returns the latest 10 as "recent"
+    def latest_block(self):
+        with self.lock:
+            return self.block_number
+
+    def fetch_alert_count(self, block):
+        with self.lock:
+            return sum(1 for alert in self.alerts if alert["block"] <= block)
+
+    def fetch_recent_alerts(self, block):
+        with self.lock:
+            mined = [alert for alert in self.alerts if alert["block"] <= block]
+            return [{field: alert[field] for field in ALERT_FIELDS} for alert in mined[-10:]]
+
+    def fetch_alert(self, alert_id, block):
+        with self.lock:
+            alert = self.alerts[alert_id]
+            return {field: alert[field] for field in ALERT_FIELDS}
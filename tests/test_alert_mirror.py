@@ -0,0 +1,72 @@
+from alert_mirror import AlertMirror
+from stubs import LocalChain
+
+
+class CountingChain(LocalChain):
+    """Mines every transaction at once and counts contract reads"""
+
+    def __init__(self):
+        super().__init__(block_time=0.0)
+        self.reads = 0
+
+    def fetch_alert_count(self, block):
+        self.reads += 1
+        return super().fetch_alert_count(block)
+
+    def fetch_alert(self, alert_id, block):
+        self.reads += 1
+        return super().fetch_alert(alert_id, block)
+
+    def store(self, latitude, longitude):
+        tx_hash = self.send_alert(("DEFORESTED", str(latitude), str(longitude), True),
+                                  self.get_nonce(), 0, 0)
+        self.get_receipt(tx_hash)
+
+
+def test_sync_mirrors_mined_alerts(tmp_path):
+    chain = CountingChain()
+    chain.store(12.97, 77.59)
+    chain.store(21.95, 89.18)
+    mirror = AlertMirror(str(tmp_path / "mirror.db"), chain)
+    try:
+        assert mirror.sync() == 2
+        assert mirror.count() == 2
+
+        nearby = mirror.query(bbox=(12.8, 77.4, 13.1, 77.7))
+        assert [(alert["latitude"], alert["longitude"]) for alert in nearby] == [(12.97, 77.59)]
+        assert len(mirror.query(alert_type="DEFORESTED")) == 2
+        assert mirror.query(alert_type="FOREST") == []
+    finally:
+        mirror.close()
+
+
+def test_sync_reads_only_new_blocks_and_alerts(tmp_path):
+    chain = CountingChain()
+    chain.store(12.97, 77.59)
+    path = str(tmp_path / "mirror.db")
+    mirror = AlertMirror(path, chain)
+    try:
+        assert mirror.sync() == 1
+
+        # No new block: the contract is not read at all
+        reads = chain.reads
+        assert mirror.sync() == 0
+        assert chain.reads == reads
+
+        # More alerts than getRecentAlerts returns; the rest are fetched one by one
+        for i in range(12):
+            chain.store(10.0 + i, 77.0)
+        assert mirror.sync() == 12
+        assert mirror.count() == 13
+        assert [alert["id"] for alert in mirror.query(limit=3)] == [12, 11, 10]
+    finally:
+        mirror.close()
+
+    # The synced block survives a restart
+    mirror = AlertMirror(path, chain)
+    try:
+        reads = chain.reads
+        assert mirror.sync() == 0
+        assert chain.reads == reads
+    finally:
+        mirror.close()
@@ -0,0 +1,83 @@
+import time
+
+from alert_outbox import AlertOutbox
+from ethereum_integration import AlertSubmissionQueue
+from stubs import LocalChain
+
+
+class StubBlockchain:
+    """Accepts every alert; receipts are only known for hashes listed in mined"""
+
+    def __init__(self):
+        self.submitted = []
+        self.mined = {}
+
+    def submit_deforestation_alert(self, latitude, longitude, deforestation_score, callback=None,
+                                   sent_callback=None):
+        self.submitted.append((latitude, longitude, deforestation_score))
+        sent_callback(f"0x{len(self.submitted):02x}")
+        return {"status": "queued"}
+
+    def get_receipt(self, tx_hash):
+        block = self.mined.get(tx_hash)
+        return None if block is None else {"blockNumber": block}
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_retry_checks_the_earlier_transaction_before_resending(tmp_path):
+    blockchain = StubBlockchain()
+    outbox = AlertOutbox(str(tmp_path / "outbox.db"), base_backoff=0.0, poll_interval=0.01)
+    try:
+        key = outbox.enqueue(12.97, 77.59, 0.8)["key"]
+        outbox.attach(blockchain)
+        wait_for(lambda: blockchain.submitted)
+
+        # The receipt timed out, but the transaction was mined after all
+        blockchain.mined["0x01"] = 42
+        outbox.retry(key, "No receipt after 120 s")
+        wait_for(lambda: outbox.stats().get("sent") == 1)
+    finally:
+        outbox.close()
+
+    assert len(blockchain.submitted) == 1
+
+
+def test_retry_resends_when_the_earlier_transaction_was_dropped(tmp_path):
+    blockchain = StubBlockchain()
+    outbox = AlertOutbox(str(tmp_path / "outbox.db"), base_backoff=0.0, poll_interval=0.01)
+    try:
+        key = outbox.enqueue(12.97, 77.59, 0.8)["key"]
+        outbox.attach(blockchain)
+        wait_for(lambda: blockchain.submitted)
+
+        outbox.retry(key, "No receipt after 120 s")
+        wait_for(lambda: len(blockchain.submitted) == 2)
+    finally:
+        outbox.close()
+
+
+def test_delivers_and_rechecks_against_local_chain(tmp_path):
+    chain = LocalChain(block_time=0.01)
+    chain.submission_queue = AlertSubmissionQueue(chain, poll_interval=0.01)
+    outbox = AlertOutbox(str(tmp_path / "outbox.db"), chain, base_backoff=0.0, poll_interval=0.01)
+    try:
+        key = outbox.enqueue(12.97, 77.59, 0.8)["key"]
+        wait_for(lambda: outbox.stats().get("sent") == 1)
+        tx_hash = outbox.db.execute("SELECT tx_hash FROM outbox WHERE dedupe_key = ?", (key,)).fetchone()[0]
+        assert tx_hash.startswith("0x")
+
+        # A retry looks the stored hash up on the chain instead of storing the alert again
+        outbox.retry(key, "No receipt after 120 s")
+        wait_for(lambda: outbox.stats().get("sent") == 1)
+    finally:
+        outbox.close()
+        chain.submission_queue.stop()
+
+    assert len(chain.alerts) == 1
+    assert chain.next_nonce == 1
@@ -0,0 +1,110 @@
+import threading
+
+from ethereum_integration import AlertSubmissionQueue
+from stubs import LocalChain
+
+ARGS = ("DEFORESTED", "12.97", "77.59", True)
+
+
+class Results:
+    """Collects callback results and lets a test wait for a given number of them"""
+
+    def __init__(self):
+        self.items = []
+        self.changed = threading.Condition()
+
+    def __call__(self, result):
+        with self.changed:
+            self.items.append(result)
+            self.changed.notify_all()
+
+    def wait_for(self, count, timeout=5.0):
+        with self.changed:
+            assert self.changed.wait_for(lambda: len(self.items) >= count, timeout), self.items
+        return self.items
+
+
+class FlakyChain(LocalChain):
+    """Fails the first send with a network error, before the node sees the nonce"""
+
+    def __init__(self):
+        super().__init__(block_time=0.01)
+        self.failed = False
+
+    def send_alert(self, args, nonce, gas, gas_price):
+        if not self.failed:
+            self.failed = True
+            raise ConnectionError("connection reset by peer")
+        return super().send_alert(args, nonce, gas, gas_price)
+
+
+class DroppingChain(LocalChain):
+    """Accepts the first transaction but drops it from the mempool, so no receipt ever comes"""
+
+    def __init__(self):
+        super().__init__(block_time=0.01)
+        self.dropped = None
+
+    def send_alert(self, args, nonce, gas, gas_price):
+        if self.dropped is None:
+            self.dropped = b"dropped"
+            return self.dropped
+        return super().send_alert(args, nonce, gas, gas_price)
+
+    def get_receipt(self, tx_hash):
+        if tx_hash == self.dropped:
+            return None
+        return super().get_receipt(tx_hash)
+
+
+def test_alerts_are_mined_in_nonce_order():
+    chain = LocalChain(block_time=0.01)
+    submissions = AlertSubmissionQueue(chain, poll_interval=0.01)
+    results, sent = Results(), Results()
+    try:
+        for i in range(5):
+            submissions.submit(("DEFORESTED", str(i), "77.59", True), results, sent)
+        results.wait_for(5)
+    finally:
+        submissions.stop()
+
+    assert [result["status"] for result in results.items] == ["success"] * 5
+    assert len(sent.items) == 5
+    assert chain.next_nonce == 5
+    # Gas price and estimate are fetched once and reused
+    assert chain.gas_price_calls == 1
+    assert chain.estimate_calls == 1
+
+
+def test_failed_send_does_not_leave_a_nonce_gap():
+    chain = FlakyChain()
+    submissions = AlertSubmissionQueue(chain, poll_interval=0.01)
+    results = Results()
+    try:
+        for _ in range(3):
+            submissions.submit(ARGS, results)
+        results.wait_for(3)
+    finally:
+        submissions.stop()
+
+    statuses = [result["status"] for result in results.items]
+    assert statuses.count("error") == 1
+    assert statuses.count("success") == 2
+    assert chain.next_nonce == 2
+
+
+def test_receipt_timeout_releases_the_nonce():
+    chain = DroppingChain()
+    submissions = AlertSubmissionQueue(chain, poll_interval=0.01, receipt_timeout=0.1)
+    results = Results()
+    try:
+        submissions.submit(ARGS, results)
+        assert results.wait_for(1)[0]["status"] == "error"
+
+        # The dropped transaction's nonce is reused instead of being skipped
+        submissions.submit(ARGS, results)
+        assert results.wait_for(2)[1]["status"] == "success"
+    finally:
+        submissions.stop()
+
+    assert chain.next_nonce == 1
@@ -0,0 +1,38 @@
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+
+from evidence_buffer import EvidenceBuffer
+
+
+def noise_frame(seed, size=(240, 640)):
+    # Noise does not compress, so every JPEG is about the same size
+    return np.random.default_rng(seed).integers(0, 256, size + (3,), dtype=np.uint8)
+
+
+def test_ring_keeps_the_latest_frames_as_thumbnails(tmp_path):
+    buffer = EvidenceBuffer(capacity=3, evidence_dir=str(tmp_path), thumbnail_width=160)
+    for i in range(5):
+        buffer.add(noise_frame(i), {"index": i})
+
+    recent = buffer.recent()
+    assert [results["index"] for _, results in recent] == [2, 3, 4]
+    assert recent[0][0].shape == (60, 160, 3)
+
+
+def test_oldest_evidence_is_deleted_beyond_the_budget(tmp_path):
+    buffer = EvidenceBuffer(evidence_dir=str(tmp_path), max_bytes=1)
+    buffer.save(noise_frame(0), 0)
+    buffer.close()
+    one_file = buffer.total_bytes
+
+    buffer = EvidenceBuffer(evidence_dir=str(tmp_path), max_bytes=int(one_file * 2.5))
+    paths = [buffer.save(noise_frame(i), i) for i in range(1, 6)]
+    buffer.close()
+
+    remaining = sorted(os.listdir(tmp_path))
+    assert len(remaining) == 2
+    assert remaining == sorted(os.path.basename(path) for path in paths[-2:])
+    assert buffer.total_bytes <= buffer.max_bytes
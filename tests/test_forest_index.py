@@ -0,0 +1,88 @@
+import socket
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("requests")
+
+from forest2 import ForestIndex, get_forest_data
+from stubs import LocalOverpassServer
+
+NODES = [
+    {"id": 1, "lat": 21.95, "lon": 89.18, "tags": {"name": "Sundarbans"}, "timestamp": "2024-01-01T00:00:00Z"},
+    {"id": 2, "lat": 12.80, "lon": 77.58, "tags": {"name": "Bannerghatta"}, "timestamp": "2024-01-01T00:00:00Z"},
+    {"id": 3, "lat": 11.08, "lon": 76.44, "tags": {"name": "Silent Valley"}, "timestamp": "2024-01-01T00:00:00Z"},
+]
+
+
+def unused_url():
+    """Interpreter URL on a port nothing listens on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/api/interpreter"
+
+
+def test_refresh_builds_searchable_index(tmp_path):
+    index = ForestIndex(str(tmp_path))
+    with LocalOverpassServer(NODES) as server:
+        assert index.refresh(server.url) == 3
+
+    # Reopening reads the saved memory-mapped files
+    index = ForestIndex(str(tmp_path))
+    assert len(index) == 3
+    name, lat, lon, distance_km = index.nearest(12.9, 77.6)
+    assert name == "Bannerghatta"
+    assert distance_km < 15
+
+    inside = index.within_bbox(10.0, 75.0, 13.0, 78.0)
+    assert sorted(map(tuple, inside.tolist())) == [(11.08, 76.44), (12.80, 77.58)]
+
+
+def test_second_refresh_only_fetches_changed_nodes(tmp_path):
+    index = ForestIndex(str(tmp_path))
+    with LocalOverpassServer(NODES) as server:
+        index.refresh(server.url)
+        server.elements = NODES + [
+            {"id": 4, "lat": 26.58, "lon": 93.17, "tags": {"name": "Kaziranga"}, "timestamp": "2999-01-01T00:00:00Z"}
+        ]
+        assert index.refresh(server.url) == 1
+
+    assert '(newer:"' not in server.queries[0]
+    assert '(newer:"' in server.queries[1]
+    assert len(index) == 4
+    assert index.nearest(26.6, 93.2)[0] == "Kaziranga"
+
+
+def test_failed_first_refresh_does_not_stamp_the_index(tmp_path):
+    assert get_forest_data(unused_url(), timeout=2) is None
+
+    index = ForestIndex(str(tmp_path))
+    assert index.refresh(unused_url()) is None
+    assert index.meta["refreshed_at"] is None
+    assert len(index) == 0
+
+    # The next refresh still asks for the full dataset
+    with LocalOverpassServer(NODES) as server:
+        assert index.refresh(server.url) == 3
+    assert '(newer:"' not in server.queries[0]
+
+
+def test_nearest_matches_brute_force_inside_and_outside_the_grid(tmp_path):
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    coords = np.column_stack([rng.uniform(8.0, 30.0, 500), rng.uniform(70.0, 95.0, 500)])
+    index = ForestIndex(str(tmp_path), cell_size=0.5)
+    index.build([{"id": i + 1, "name": f"Forest {i}", "latitude": lat, "longitude": lon}
+                 for i, (lat, lon) in enumerate(coords.tolist())])
+
+    # Random points inside the grid plus points well beyond each of its edges
+    queries = np.column_stack([rng.uniform(8.0, 30.0, 50), rng.uniform(70.0, 95.0, 50)]).tolist()
+    queries += [(-20.0, 80.0), (60.0, 80.0), (20.0, 40.0), (20.0, 130.0), (-5.0, 100.0)]
+    for lat, lon in queries:
+        lon_scale = np.cos(np.radians(lat))
+        expected = np.argmin(np.hypot(coords[:, 0] - lat, (coords[:, 1] - lon) * lon_scale))
+        name, found_lat, found_lon, _ = index.nearest(lat, lon)
+        assert (found_lat, found_lon) == tuple(coords[expected]), (lat, lon)
+
+    assert index.nearest(float('nan'), 80.0) is None
@@ -0,0 +1,66 @@
+import math
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from history_grid import HistoryGrid
+from com import get_deforestation_data
+
+
+@pytest.fixture
+def grid(tmp_path):
+    csv_path = tmp_path / "loss.csv"
+    csv_path.write_text(
+        "latitude,longitude,year,loss_percent\n"
+        "12.01,77.01,2018,10\n"
+        "12.02,77.02,2018,20\n"  # Same cell and year: averaged
+        "12.01,77.01,2020,30\n"
+        "12.51,77.51,2019,5\n"
+    )
+    grid = HistoryGrid(str(tmp_path / "grid"))
+    assert grid.import_csv(str(csv_path), cell_size=0.5) == 4
+    return grid
+
+
+def test_import_csv_averages_cells_and_keeps_gaps(grid):
+    assert grid.years == [2018, 2019, 2020]
+    assert grid.loss.shape == (2, 2, 3)
+    values = grid.lookup(12.1, 77.1)
+    assert values[0] == pytest.approx(15.0)
+    assert math.isnan(values[1])
+    assert values[2] == pytest.approx(30.0)
+
+
+def test_lookup_outside_grid_or_nan_is_none(grid):
+    assert grid.lookup(40.0, 77.1) is None
+    assert grid.lookup(float('nan'), 77.1) is None
+    assert grid.cell_of(12.1, float('inf')) is None
+
+
+def test_lookup_many_matches_lookup_and_slices_years(grid):
+    latitudes = [12.1, 12.6, 40.0, float('nan')]
+    longitudes = [77.1, 77.6, 77.1, 77.1]
+    result = grid.lookup_many(latitudes, longitudes)
+    assert result.shape == (4, 3)
+    np.testing.assert_array_equal(result[0], grid.lookup(12.1, 77.1))
+    np.testing.assert_array_equal(result[1], grid.lookup(12.6, 77.6))
+    assert np.isnan(result[2:]).all()
+
+    sliced = grid.lookup_many(latitudes, longitudes, start_year=2019, end_year=2020)
+    assert sliced.shape == (4, 2)
+    assert sliced[1, 0] == pytest.approx(5.0)
+
+
+def test_reopened_grid_is_memory_mapped(grid):
+    reopened = HistoryGrid(grid.grid_dir)
+    assert isinstance(reopened.loss, np.memmap)
+    np.testing.assert_array_equal(reopened.lookup(12.1, 77.1), grid.lookup(12.1, 77.1))
+
+
+def test_deforestation_data_skips_years_without_data(grid):
+    result = get_deforestation_data(12.1, 77.1, grid=grid)
+    assert result['historical_data'] == [
+        {'year': 2018, 'deforestation_percent': 15.0},
+        {'year': 2020, 'deforestation_percent': 30.0},
+    ]
+    assert get_deforestation_data(40.0, 77.1, grid=grid)['historical_data'] == []
@@ -0,0 +1,57 @@
+import time
+import pytest
+
+pytest.importorskip("requests")
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from model_client import ModelClient
+from stubs import StubModelServer
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def wait_for(app, condition, timeout=5.0):
+    """Process queued signals until condition() holds or the timeout passes"""
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return condition()
+
+
+def test_predict_posts_capture_and_reports_result(app):
+    with StubModelServer({"deforestation_score": 0.7}) as server:
+        client = ModelClient(server.base_url)
+        results = []
+        client.result_ready.connect(results.append)
+        try:
+            assert client.predict(b"jpeg-bytes", 12.5, 77.25)
+            assert wait_for(app, lambda: results)
+        finally:
+            client.close()
+
+    assert results[0]["deforestation_score"] == 0.7
+    assert (results[0]["latitude"], results[0]["longitude"]) == (12.5, 77.25)
+    request = server.requests[0]
+    assert request["path"] == "/predict"
+    assert b"jpeg-bytes" in request["body"]
+    assert b"77.25" in request["body"]
+
+
+def test_server_error_is_reported_as_failure(app):
+    with StubModelServer({"detail": "model not loaded"}, status=500) as server:
+        client = ModelClient(server.base_url)
+        failures = []
+        client.request_failed.connect(lambda title, message: failures.append((title, message)))
+        try:
+            assert client.predict(b"jpeg-bytes", 0.0, 0.0)
+            assert wait_for(app, lambda: failures)
+        finally:
+            client.close()
+
+    title, message = failures[0]
+    assert title == "Server Error"
+    assert "500" in message and "model not loaded" in message
@@ -0,0 +1,68 @@
+import prediction_cache
+from prediction_cache import PredictionCache, difference_hash
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, monkeypatch, **kwargs):
+    clock = Clock()
+    monkeypatch.setattr(prediction_cache.time, "time", clock)
+    return PredictionCache(str(tmp_path / "cache.json"), **kwargs), clock
+
+
+def test_difference_hash_is_stable_under_small_changes():
+    rows = [[(x * 7 + y * 3) % 50 for x in range(9)] for y in range(8)]
+    brighter = [[value + 2 for value in row] for row in rows]
+    assert difference_hash(rows) == difference_hash(brighter)
+    assert difference_hash(rows) != difference_hash([row[::-1] for row in rows])
+
+
+def test_hit_within_hash_distance(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch, max_hash_distance=2)
+    cache.put(12.97, 77.59, 5000, 0b1111, {"deforestation_score": 0.4})
+
+    assert cache.get(12.9701, 77.5899, 5000, 0b1100) == {"deforestation_score": 0.4}
+    assert cache.get(12.97, 77.59, 5000, 0b0000) is None  # 4 bits apart
+    assert cache.get(12.97, 77.59, 50000, 0b1111) is None  # Different height bucket
+    assert cache.stats()["hits"] == 1
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl=60)
+    cache.put(12.97, 77.59, 5000, 1, {"deforestation_score": 0.4})
+
+    clock.now += 59
+    assert cache.get(12.97, 77.59, 5000, 1) is not None
+    clock.now += 2
+    assert cache.get(12.97, 77.59, 5000, 1) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_view_is_evicted(tmp_path, monkeypatch):
+    cache, _ = make_cache(tmp_path, monkeypatch, max_entries=2)
+    cache.put(1.0, 1.0, 5000, 1, {"view": 1})
+    cache.put(2.0, 2.0, 5000, 1, {"view": 2})
+    assert cache.get(1.0, 1.0, 5000, 1) == {"view": 1}  # View 2 is now the oldest
+
+    cache.put(3.0, 3.0, 5000, 1, {"view": 3})
+    assert cache.get(2.0, 2.0, 5000, 1) is None
+    assert cache.get(1.0, 1.0, 5000, 1) == {"view": 1}
+    assert cache.get(3.0, 3.0, 5000, 1) == {"view": 3}
+
+
+def test_unexpired_entries_are_reloaded(tmp_path, monkeypatch):
+    cache, clock = make_cache(tmp_path, monkeypatch, ttl=60)
+    cache.put(1.0, 1.0, 5000, 1, {"view": 1})
+    clock.now += 30
+    cache.put(2.0, 2.0, 5000, 1, {"view": 2})
+
+    clock.now += 40  # The first view expires, the second does not
+    reloaded = PredictionCache(cache.path, ttl=60)
+    assert reloaded.get(1.0, 1.0, 5000, 1) is None
+    assert reloaded.get(2.0, 2.0, 5000, 1) == {"view": 2}
@@ -0,0 +1,63 @@
+import csv
+import json
+
+from results_store import ResultsStore
+
+
+def result(timestamp, latitude, longitude, score):
+    return {"timestamp": timestamp, "latitude": latitude, "longitude": longitude,
+            "deforestation_score": score, "classification": "DEFORESTED",
+            "historical_data": [{"year": 2020, "deforestation_percent": 12.5}]}
+
+
+def filled_store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"), flush_interval=0.05)
+    for row in [result(100, 12.95, 77.55, 0.8), result(200, 12.99, 77.61, 0.3),
+                result(300, 21.95, 89.18, 0.6), result(400, 12.97, 77.59, 0.5)]:
+        store.record(row)
+    store.flush()
+    return store
+
+
+def test_query_by_bbox_and_time(tmp_path):
+    store = filled_store(tmp_path)
+    try:
+        assert len(store.query()) == 4
+
+        bangalore = store.query(bbox=(12.9, 77.5, 13.0, 77.6))
+        assert [r["timestamp"] for r in bangalore] == [100, 400]
+        assert bangalore[0]["historical_data"] == [{"year": 2020, "deforestation_percent": 12.5}]
+
+        assert [r["timestamp"] for r in store.query(start=200, end=300)] == [200, 300]
+        assert [r["timestamp"] for r in store.query(bbox=(12.9, 77.5, 13.0, 77.7), start=150)] == [200, 400]
+        assert len(store.query(limit=2)) == 2
+    finally:
+        store.close()
+
+
+def test_export_csv_and_jsonl(tmp_path):
+    store = filled_store(tmp_path)
+    try:
+        csv_path = str(tmp_path / "out.csv")
+        assert store.export(csv_path, bbox=(12.9, 77.5, 13.0, 77.7), batch_size=1) == 3
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [float(row["timestamp"]) for row in rows] == [100, 200, 400]
+        assert json.loads(rows[0]["historical_data"])[0]["year"] == 2020
+
+        jsonl_path = str(tmp_path / "out.jsonl")
+        assert store.export(jsonl_path, start=300) == 2
+        with open(jsonl_path) as f:
+            lines = [json.loads(line) for line in f]
+        assert [line["latitude"] for line in lines] == [21.95, 12.97]
+    finally:
+        store.close()
+
+
+def test_results_survive_reopening(tmp_path):
+    filled_store(tmp_path).close()
+    store = ResultsStore(str(tmp_path / "results.db"))
+    try:
+        assert len(store.query()) == 4
+    finally:
+        store.close()
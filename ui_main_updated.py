@@ -1,35 +1,69 @@
 import sys
 import time
 import os
-import requests
-from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
-    QLineEdit, QPushButton, QLabel, QProgressBar, QMessageBox
-)
-from Rep import DeforestationAnalysis
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import QTimer, QUrl, Qt
-from PyQt6.QtGui import QIcon, QFont
-from ethereum_integration import EthereumBlockchain 
-from forest2 import get_forest_data
-import matplotlib.pyplot as plt
-from PyQt6.QtWidgets import QVBoxLayout, QPushButton, QWidget, QLabel, QFileDialog
-import pandas as pd
-
-import requests
-import matplotlib.pyplot as plt
-from PyQt6.QtWidgets import QLineEdit, QMessageBox
-
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
+import base64
+import threading
 from datetime import datetime
-from com import get_deforestation_data
-from deforest1 import ForestMonitoringApp  # Make sure 1.py is renamed to deforest1.py
+from startup_timing import startup_timer
 
+# Only what the first window needs is imported here; web3, matplotlib and the
+# poaching monitor (cv2, librosa) are loaded after first paint or on first use
+with startup_timer.measure("import", "PyQt6"):
+    from PyQt6.QtWidgets import (
+        QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, 
+        QLineEdit, QPushButton, QLabel, QProgressBar, QMessageBox
+    )
+    from PyQt6.QtCore import QTimer, Qt, QByteArray, QBuffer, QIODevice, QObject, pyqtSignal, pyqtSlot
+    from PyQt6.QtGui import QImage
 
+# QtWebEngine has to be imported before the QApplication is created
+with startup_timer.measure("import", "PyQt6.QtWebEngine"):
+    from PyQt6.QtWebEngineWidgets import QWebEngineView
+    from PyQt6.QtWebChannel import QWebChannel
 
+with startup_timer.measure("import", "app modules"):
+    import requests
+    import numpy as np
+    from com import get_deforestation_data
+    from model_client import ModelClient
+    from prediction_cache import PredictionCache, difference_hash
+    from alert_outbox import AlertOutbox
+    from alert_mirror import AlertMirror
+    from results_store import ResultsStore
+
+# Forest index points plotted on the map: (min_lat, min_lon, max_lat, max_lon)
+INDIA_BBOX = (6.0, 68.0, 37.5, 97.5)
+
+# On-chain alerts within this many degrees of an analyzed point are shown with it
+ALERT_HISTORY_RADIUS = 0.1
+
+# Imported in the background after the window is painted, so first use does not stall
+DEFERRED_IMPORTS = [
+    "comparison_chart",
+    "forest2",
+    "deforest1",
+]
+
+
+class CameraBridge(QObject):
+    """Receives camera move-end events from the Cesium page over QWebChannel"""
+    camera_moved = pyqtSignal(dict)
+
+    @pyqtSlot(float, float, float, float)
+    def cameraMoved(self, latitude, longitude, height, camera_height):
+        self.camera_moved.emit({
+            'latitude': latitude,
+            'longitude': longitude,
+            'height': height,
+            'cameraHeight': camera_height
+        })
+
+
+class MainWindow(QMainWindow):
+    blockchain_result_ready = pyqtSignal(dict)
+    background_services_ready = pyqtSignal(object, object)  # (EthereumBlockchain, AlertMirror), None if unavailable
+    forest_index_refreshed = pyqtSignal(object, object)  # (ForestIndex, changed count or None)
 
-class MainWindow(QMainWindow , EthereumBlockchain):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Deforestation Analysis - 3D Map Viewer")
@@ -38,22 +72,64 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         # Current location coordinates
         self.current_latitude = 0.0
         self.current_longitude = 0.0
+        self.current_height = 0.0
+        
+        # Predictions for views analyzed before (survives restarts)
+        self.prediction_cache = PredictionCache(
+            os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "prediction_cache.json")
+        )
+        self.pending_capture = None
+        
+        # Offline forest index, opened on first use; refreshed from Overpass on demand
+        self.forest_index = None
+        self.forest_refreshing = False
+        self.map_loaded = False
+        self.forest_index_refreshed.connect(self.handle_forest_index_refreshed)
         
         # Status indicators
         self.is_loading = False
         self.is_analyzing = False
         
-        # Initialize Ethereum blockchain
-        try:
-            self.blockchain = EthereumBlockchain()
-            print("The Location Got Success")
-            print("Blockchain integration initialized")
-        except Exception as e:
-            self.blockchain = None
-            print(f"Failed to initialize blockchain: {str(e)}")
+        # Comparison window, built on the first analysis and reused afterwards
+        self.comparison_window = None
+        self.shown_alert_key = None
+        
+        # Every analysis is appended here (replaces analysis_result_*.txt files)
+        self.results_store = ResultsStore(
+            os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "analysis_results.db")
+        )
+        
+        # Alerts are persisted here first and delivered once the blockchain connects
+        self.alert_outbox = AlertOutbox(
+            os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "alert_outbox.db")
+        )
+        
+        # Ethereum blockchain connects in the background after first paint
+        self.blockchain = None
+        self.alert_mirror = None  # Local copy of on-chain alerts for history queries
+        self.blockchain_result_ready.connect(self.handle_blockchain_result)
+        self.background_services_ready.connect(self.handle_background_services)
+        self.background_started = False
+
+        # Captures are encoded in memory; capture_size=None uploads full resolution
+        self.capture_size = (224, 224)
+        self.capture_format = "JPEG"
+        self.capture_quality = 85
+
+        # Model API client; requests run in the background and report back via signals
+        self.model_client = ModelClient("http://127.0.0.1:8000")
+        self.model_client.result_ready.connect(self.handle_model_result)
+        self.model_client.request_failed.connect(self.handle_model_error)
+
+        # Bridge the page uses to push camera moves (replaces 1 Hz polling)
+        self.camera_bridge = CameraBridge()
+        self.camera_bridge.camera_moved.connect(self.handle_coordinates_result)
+        self.web_channel = QWebChannel()
+        self.web_channel.registerObject("cameraBridge", self.camera_bridge)
 
         # Create a web view widget
         self.browser = QWebEngineView()
+        self.browser.page().setWebChannel(self.web_channel)
         self.browser.setHtml(self.get_html())  # Load CesiumJS map
         self.browser.loadFinished.connect(self.on_page_loaded)
 
@@ -84,6 +160,10 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         self.plot_forests_button.clicked.connect(self.plot_indian_forests)
         self.plot_forests_button.setEnabled(False)  # Disabled until map loads
         
+        # Button to fetch new and changed forests into the offline index
+        self.refresh_forests_button = QPushButton("Update Forest Data")
+        self.refresh_forests_button.clicked.connect(self.refresh_forest_index)
+        
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -110,6 +190,7 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         action_layout = QHBoxLayout()
         action_layout.addWidget(self.capture_button)
         action_layout.addWidget(self.plot_forests_button)
+        action_layout.addWidget(self.refresh_forests_button)
         action_layout.addWidget(self.progress_bar)
         main_layout.addLayout(action_layout)
         
@@ -123,6 +204,62 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         self.poaching_detection_button.clicked.connect(self.open_poaching_window)
         action_layout.addWidget(self.poaching_detection_button)
 
+    def closeEvent(self, event):
+        """Write out queued analysis results and release network clients before the app exits"""
+        self.results_store.close()
+        self.alert_outbox.close()
+        if self.alert_mirror is not None:
+            self.alert_mirror.close()
+        self.model_client.close()
+        super().closeEvent(event)
+
+    def paintEvent(self, event):
+        """Start deferred services once the window has been painted for the first time"""
+        super().paintEvent(event)
+        if not self.background_started:
+            self.background_started = True
+            startup_timer.mark("first paint")
+            QTimer.singleShot(0, self.start_background_services)
+
+    def start_background_services(self):
+        threading.Thread(target=self.load_background_services, daemon=True,
+                         name="startup-services").start()
+
+    def load_background_services(self):
+        """Connect to the blockchain and warm up heavy modules off the GUI thread"""
+        blockchain = alert_mirror = None
+        with startup_timer.measure("service", "blockchain"):
+            try:
+                EthereumBlockchain = startup_timer.import_module("ethereum_integration").EthereumBlockchain
+                blockchain = EthereumBlockchain()
+                print("Blockchain integration initialized")
+                alert_mirror = AlertMirror(
+                    os.path.join(os.path.expanduser("~"), ".deforestation_analyser", "alert_mirror.db"),
+                    blockchain
+                )
+                print(f"Synced {alert_mirror.sync()} new alerts from the blockchain")
+            except Exception as e:
+                print(f"Failed to initialize blockchain: {str(e)}")
+        # The window's attributes are only assigned on the GUI thread
+        self.background_services_ready.emit(blockchain, alert_mirror)
+
+        for name in DEFERRED_IMPORTS:
+            try:
+                startup_timer.import_module(name)
+            except Exception as e:
+                print(f"Failed to preload {name}: {str(e)}")
+
+        startup_timer.mark("background services ready")
+        print(startup_timer.report())
+
+    def handle_background_services(self, blockchain, alert_mirror):
+        """Called on the GUI thread once the blockchain connection and alert mirror are ready"""
+        self.blockchain = blockchain
+        self.alert_mirror = alert_mirror
+        if blockchain is not None:
+            blockchain.mirror = alert_mirror
+            self.alert_outbox.attach(blockchain)
+
     def get_html(self):
         return """
         <!DOCTYPE html>
@@ -130,6 +267,7 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         <head>
             <script src="https://cesium.com/downloads/cesiumjs/releases/1.99/Build/Cesium/Cesium.js"></script>
             <link href="https://cesium.com/downloads/cesiumjs/releases/1.99/Build/Cesium/Widgets/widgets.css" rel="stylesheet">
+            <script src="qrc:///qtwebchannel/qwebchannel.js"></script>
             <style>
                 html, body, #cesiumContainer { width: 100%; height: 100%; margin: 0; padding: 0; overflow: hidden; }
             </style>
@@ -210,6 +348,7 @@ class MainWindow(QMainWindow , EthereumBlockchain):
                 function clearMap() {
                     try {
                         viewer.entities.removeAll();
+                        clearForestPoints();
                         return true;
                     } catch (error) {
                         console.error('Error clearing map:', error);
@@ -217,6 +356,129 @@ class MainWindow(QMainWindow , EthereumBlockchain):
                     }
                 }
 
+                // Forest nodes as point primitives; far away only a decimated subset is drawn
+                let forestLayers = [];
+                const FAR_POINT_BUDGET = 20000;
+                const NEAR_DISTANCE = 2.0e6;
+
+                function clearForestPoints() {
+                    for (const layer of forestLayers) {
+                        viewer.scene.primitives.remove(layer);
+                    }
+                    forestLayers = [];
+                }
+
+                function loadForestPoints(encoded) {
+                    // Packed little-endian float32 [lon0, lat0, lon1, lat1, ...]
+                    const binary = atob(encoded);
+                    const bytes = new Uint8Array(binary.length);
+                    for (let i = 0; i < binary.length; i++) {
+                        bytes[i] = binary.charCodeAt(i);
+                    }
+                    const coords = new Float32Array(bytes.buffer);
+                    const count = coords.length / 2;
+
+                    clearForestPoints();
+                    const stride = Math.max(1, Math.ceil(count / FAR_POINT_BUDGET));
+                    const near = new Cesium.PointPrimitiveCollection();
+                    const far = new Cesium.PointPrimitiveCollection();
+                    const nearCondition = stride > 1 ? new Cesium.DistanceDisplayCondition(0.0, NEAR_DISTANCE) : undefined;
+                    const farCondition = new Cesium.DistanceDisplayCondition(NEAR_DISTANCE, Number.MAX_VALUE);
+                    const color = Cesium.Color.GREEN.withAlpha(0.8);
+                    const scale = new Cesium.NearFarScalar(1.0e4, 1.5, 5.0e6, 0.6);
+
+                    for (let i = 0; i < count; i++) {
+                        const position = Cesium.Cartesian3.fromDegrees(coords[2 * i], coords[2 * i + 1]);
+                        near.add({
+                            position: position,
+                            pixelSize: 5,
+                            color: color,
+                            outlineColor: Cesium.Color.WHITE,
+                            outlineWidth: 1,
+                            scaleByDistance: scale,
+                            distanceDisplayCondition: nearCondition,
+                            id: i
+                        });
+                        if (stride > 1 && i % stride === 0) {
+                            far.add({
+                                position: position,
+                                pixelSize: 4,
+                                color: color,
+                                scaleByDistance: scale,
+                                distanceDisplayCondition: farCondition,
+                                id: i
+                            });
+                        }
+                    }
+
+                    forestLayers.push(viewer.scene.primitives.add(near));
+                    if (stride > 1) {
+                        forestLayers.push(viewer.scene.primitives.add(far));
+                    }
+                    return count;
+                }
+
+                // Push camera position to Python over QWebChannel instead of being polled
+                let cameraBridge = null;
+                let lastReported = null;
+                let reportTimer = null;
+
+                function viewCenter() {
+                    const windowPosition = new Cesium.Cartesian2(
+                        viewer.canvas.clientWidth / 2,
+                        viewer.canvas.clientHeight / 2
+                    );
+                    const ray = viewer.camera.getPickRay(windowPosition);
+                    const cartesian = ray ? viewer.scene.globe.pick(ray, viewer.scene) : undefined;
+                    const cartographic = cartesian
+                        ? Cesium.Cartographic.fromCartesian(cartesian)
+                        : viewer.camera.positionCartographic;
+                    return {
+                        latitude: Cesium.Math.toDegrees(cartographic.latitude),
+                        longitude: Cesium.Math.toDegrees(cartographic.longitude),
+                        height: cartographic.height,
+                        cameraHeight: viewer.camera.positionCartographic.height
+                    };
+                }
+
+                function reportCamera() {
+                    reportTimer = null;
+                    if (!cameraBridge) {
+                        return;
+                    }
+                    const center = viewCenter();
+                    // Only send when the view actually changed
+                    if (lastReported &&
+                        Math.abs(center.latitude - lastReported.latitude) < 1e-6 &&
+                        Math.abs(center.longitude - lastReported.longitude) < 1e-6 &&
+                        Math.abs(center.cameraHeight - lastReported.cameraHeight) < 1) {
+                        return;
+                    }
+                    lastReported = center;
+                    cameraBridge.cameraMoved(center.latitude, center.longitude, center.height, center.cameraHeight);
+                }
+
+                function scheduleReport(delay) {
+                    // Throttle: at most one pick per delay while the camera is moving
+                    if (reportTimer === null) {
+                        reportTimer = setTimeout(reportCamera, delay);
+                    }
+                }
+
+                viewer.camera.percentageChanged = 0.05;
+                viewer.camera.changed.addEventListener(() => scheduleReport(250));
+                viewer.camera.moveEnd.addEventListener(() => {
+                    if (reportTimer !== null) {
+                        clearTimeout(reportTimer);
+                    }
+                    reportCamera();
+                });
+
+                new QWebChannel(qt.webChannelTransport, function(channel) {
+                    cameraBridge = channel.objects.cameraBridge;
+                    reportCamera();
+                });
+
                 // Initial view - India
                 zoomToLocation(20.5937, 78.9629, 5000000);
             </script>
@@ -228,13 +490,11 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         """Called when the web page finishes loading"""
         if (success):
             self.status_label.setText("Map loaded")
-            # Set up a timer to periodically update coordinates
-            self.coord_timer = QTimer(self)
-            self.coord_timer.timeout.connect(self.update_coordinates)
-            self.coord_timer.start(1000)  # Update every second
+            # Coordinates now arrive from the page via camera_bridge when the camera moves
             
             # Enable forest plotting button
-            self.plot_forests_button.setEnabled(True)
+            self.map_loaded = True
+            self.plot_forests_button.setEnabled(not self.forest_refreshing)
             
             # Auto-navigate to India to prepare for plotting forests
             QTimer.singleShot(1000, lambda: self.navigate_to_specific_country("India"))
@@ -246,49 +506,13 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         self.input_field.setText(country_name)
         self.navigate_to_country()
     
-    def update_coordinates(self):
-        """Updates the current coordinates from the map view"""
-        js_command = """
-        (function() {
-            if (typeof viewer !== 'undefined' && viewer && viewer.camera) {
-                // Get the center of the screen (where the user is looking)
-                const windowPosition = new Cesium.Cartesian2(
-                    viewer.canvas.clientWidth / 2,
-                    viewer.canvas.clientHeight / 2
-                );
-                
-                
-                const ray = viewer.camera.getPickRay(windowPosition);
-                const cartesian = viewer.scene.globe.pick(ray, viewer.scene);
-                
-                // If we got a valid point, convert to lat/long
-                if (cartesian) {
-                    const cartographic = Cesium.Cartographic.fromCartesian(cartesian);
-                    const longitude = Cesium.Math.toDegrees(cartographic.longitude);
-                    const latitude = Cesium.Math.toDegrees(cartographic.latitude);
-                    const height = cartographic.height;
-                    return {latitude: latitude, longitude: longitude, height: height};
-                }
-                
-                // Fallback to camera position if no surface point found
-                const position = viewer.camera.position;
-                const camCartographic = Cesium.Cartographic.fromCartesian(position);
-                const camLongitude = Cesium.Math.toDegrees(camCartographic.longitude);
-                const camLatitude = Cesium.Math.toDegrees(camCartographic.latitude);
-                const camHeight = camCartographic.height;
-                return {latitude: camLatitude, longitude: camLongitude, height: camHeight};
-            }
-            return null;
-        })();
-        """
-        self.browser.page().runJavaScript(js_command, self.handle_coordinates_result)
-    
     def handle_coordinates_result(self, result):
         """Handles the coordinates result from JavaScript"""
         if result:
-            self.current_latitude = result['latitude']
-            self.current_longitude = result['longitude']
-            self.coords_label.setText(f"Lat: {self.current_latitude:.6f}°, Lon: {self.current_longitude:.6f}°")
+            position = (result['latitude'], result['longitude'], result.get('cameraHeight', 0.0))
+            if position != (self.current_latitude, self.current_longitude, self.current_height):
+                self.current_latitude, self.current_longitude, self.current_height = position
+                self.coords_label.setText(f"Lat: {self.current_latitude:.6f}°, Lon: {self.current_longitude:.6f}°")
             
             # Enable capture button if we have valid coordinates
             if not self.capture_button.isEnabled() and not self.is_analyzing:
@@ -337,79 +561,91 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         self.progress_bar.setVisible(True)
         self.capture_button.setEnabled(False)
         
-        # Create a timestamp for unique filename
-        timestamp = int(time.time())
-        screenshot_path = f"screenshot_{timestamp}.png"
-        
         # Wait for any animations to complete, then capture
-        QTimer.singleShot(500, lambda: self.save_screenshot(screenshot_path))
+        QTimer.singleShot(500, self.save_screenshot)
 
-    def save_screenshot(self, screenshot_path):
-        """Saves the screenshot properly"""
-        self.browser.grab().save(screenshot_path)
-        print(f"Screenshot saved: {screenshot_path}")
+    def save_screenshot(self):
+        """Captures the map into memory, encoded at the model's input size"""
+        pixmap = self.browser.grab()
 
-        # Send to DL model for analysis
-        self.send_to_model(screenshot_path)
+        # Same view analyzed recently: reuse the prediction instead of calling the API again
+        image_hash = self.capture_hash(pixmap)
+        self.pending_capture = (self.current_latitude, self.current_longitude, self.current_height, image_hash)
+        cached = self.prediction_cache.get(*self.pending_capture)
+        if cached is not None:
+            self.pending_capture = None
+            stats = self.prediction_cache.stats()
+            print(f"Prediction cache hit ({stats['hits']} hits / {stats['misses']} misses)")
+            self.progress_bar.setVisible(False)
+            self.is_analyzing = False
+            self.capture_button.setEnabled(True)
+            self.status_label.setText("Analysis complete (cached)")
+            # The prediction is reused, but this analysis happens now
+            cached['timestamp'] = int(time.time())
+            self.display_results(cached, store_on_chain=False)
+            return
 
-    def send_to_model(self, img_path):
-        """Sends screenshot to model API for analysis"""
-        url = "http://127.0.0.1:8000/predict"
-        if not os.path.exists(img_path):
-            QMessageBox.critical(self, "File Error", f"Screenshot file not found: {img_path}")
+        image_bytes = self.encode_capture(pixmap)
+        if image_bytes is None:
+            QMessageBox.critical(self, "Capture Error", "Could not encode the screenshot")
             self.cleanup_after_error()
             return
-            
-        try:
-            # Ensure file is properly opened and closed
-            with open(img_path, 'rb') as img_file:
-                files = {'file': ('image.jpg', img_file, 'image/jpeg')}
-                data = {
-                    'latitude': str(self.current_latitude),
-                    'longitude': str(self.current_longitude)
-                }
-                
-                response = requests.post(url, files=files, data=data, timeout=10)
-                
-                try:
-                    result = response.json()
-                except ValueError as e:
-                    print(f"Invalid JSON response: {response.text}")
-                    QMessageBox.critical(self, "Server Error", 
-                                     f"Server returned invalid data. Response: {response.text[:200]}")
-                    self.cleanup_after_error()
-                    return
-                    
-                if response.status_code == 200:
-                    if not isinstance(result, dict):
-                        raise ValueError(f"Expected dictionary response, got {type(result)}")
-                    self.display_results(result)
-                else:
-                    error_msg = result.get('detail', response.text) if isinstance(result, dict) else response.text
-                    print(f"Server error {response.status_code}: {error_msg}")
-                    QMessageBox.critical(self, "Server Error", 
-                                     f"Server error {response.status_code}: {error_msg}")
-                    self.cleanup_after_error()
-                    
-        except requests.exceptions.ConnectionError:
-            print(f"Connection error: API server not running at {url}")
-            QMessageBox.critical(self, "Connection Error", 
-                             f"Could not connect to the model API at {url}. Make sure the server is running.")
-            self.cleanup_after_error()
-            
-        except Exception as e:
-            print(f"Error sending to model: {str(e)}")
-            QMessageBox.critical(self, "Analysis Error", 
-                             f"Error during analysis: {str(e)}")
-            self.cleanup_after_error()
-            
-        finally:
-            # Clean up the screenshot file
-            try:
-                if os.path.exists(img_path):
-                    os.remove(img_path)
-            except Exception as e:
-                print(f"Error cleaning up file {img_path}: {str(e)}")
+        print(f"Screenshot captured: {len(image_bytes)} bytes ({self.capture_format})")
+
+        # Send to DL model for analysis
+        self.send_to_model(image_bytes)
+
+    def capture_hash(self, pixmap):
+        """Perceptual hash of a capture, used to recognise a view seen before"""
+        image = pixmap.toImage().scaled(9, 8, Qt.AspectRatioMode.IgnoreAspectRatio,
+                                        Qt.TransformationMode.SmoothTransformation)
+        image = image.convertToFormat(QImage.Format.Format_Grayscale8)
+        rows = [[image.pixelColor(x, y).value() for x in range(9)] for y in range(8)]
+        return difference_hash(rows)
+
+    def encode_capture(self, pixmap):
+        """Downscale a capture to capture_size (if set) and encode it straight into memory"""
+        if self.capture_size:
+            pixmap = pixmap.scaled(self.capture_size[0], self.capture_size[1],
+                                   Qt.AspectRatioMode.KeepAspectRatio,
+                                   Qt.TransformationMode.SmoothTransformation)
+
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        ok = pixmap.save(buffer, self.capture_format, self.capture_quality)
+        buffer.close()
+        return bytes(data) if ok else None
+
+    def send_to_model(self, image_bytes):
+        """Sends the encoded capture to the model API without blocking the UI"""
+        extension = "png" if self.capture_format.upper() == "PNG" else "jpg"
+        content_type = "image/png" if extension == "png" else "image/jpeg"
+
+        # The result arrives later through handle_model_result / handle_model_error
+        if not self.model_client.predict(image_bytes, self.current_latitude, self.current_longitude,
+                                         filename=f"image.{extension}", content_type=content_type):
+            self.status_label.setText("Model busy, try again shortly")
+            self.progress_bar.setVisible(False)
+            self.is_analyzing = False
+            self.capture_button.setEnabled(True)
+
+    def handle_model_result(self, result):
+        """Called on the GUI thread when the model API answers"""
+        self.progress_bar.setVisible(False)
+        self.is_analyzing = False
+        self.capture_button.setEnabled(True)
+        self.status_label.setText("Analysis complete")
+
+        if self.pending_capture is not None:
+            self.prediction_cache.put(*self.pending_capture, result)
+            self.pending_capture = None
+        self.display_results(result)
+
+    def handle_model_error(self, title, message):
+        """Called on the GUI thread when a model request fails"""
+        QMessageBox.critical(self, title, message)
+        self.cleanup_after_error()
 
     def cleanup_after_error(self):
         """Helper method to clean up UI state after an error"""
@@ -418,7 +654,61 @@ class MainWindow(QMainWindow , EthereumBlockchain):
         self.capture_button.setEnabled(True)
         self.status_label.setText("Analysis failed")
 
-    def display_results(self, data):
+    def submit_alert(self, lat, lon, deforestation_score, timestamp):
+        """Persist an alert in the outbox; the outcome arrives via blockchain_result_ready"""
+        key = self.alert_outbox.dedupe_key(lat, lon, deforestation_score, timestamp)
+        result = self.alert_outbox.enqueue(
+            lat, lon, deforestation_score, timestamp,
+            callback=lambda outcome: self.blockchain_result_ready.emit(dict(outcome, key=key))
+        )
+        if result["status"] == "duplicate":
+            print(f"Blockchain storage: alert {result['key']} already queued, not sending again")
+        return result
+
+    def handle_blockchain_result(self, result):
+        """Called on the GUI thread once a queued alert is mined or fails"""
+        if result["status"] == "success":
+            print(f"Alert stored in blockchain. Transaction hash: {result['transaction_hash']}")
+            text = (f"Transaction Hash: {result['transaction_hash'][:20]}... "
+                    f"Block Number: {result['block_number']}")
+            if self.alert_mirror is not None:
+                threading.Thread(target=self.alert_mirror.sync, daemon=True).start()
+        elif result["status"] == "skipped":
+            print(f"Blockchain storage: {result['message']}")
+            text = f"Transaction: {result['message']}"
+        else:
+            print(f"Blockchain storage: {result['message']}")
+            text = f"Transaction failed: {result['message']}"
+
+        # Only the analysis currently on screen updates the label
+        if result.get("key") is not None and result["key"] == self.shown_alert_key:
+            self.blockchain_status_label.setText(text)
+
+    def build_comparison_window(self):
+        """Create the comparison window and its chart once; display_results updates them"""
+        from comparison_chart import ComparisonChart
+        
+        self.comparison_window = QWidget()
+        layout = QVBoxLayout()
+        self.location_label = QLabel()
+        self.date_label = QLabel()
+        self.score_label = QLabel()
+        self.nearest_forest_label = QLabel()
+        self.chain_type_label = QLabel()
+        self.blockchain_status_label = QLabel()
+        self.alert_history_label = QLabel()
+        for label in (self.location_label, self.date_label, self.score_label, self.nearest_forest_label,
+                      self.chain_type_label, self.blockchain_status_label, self.alert_history_label):
+            layout.addWidget(label)
+        
+        self.comparison_chart = ComparisonChart()
+        layout.addWidget(self.comparison_chart)
+        
+        self.comparison_window.setLayout(layout)
+        self.comparison_window.setWindowTitle("Deforestation Analysis Comparison")
+        self.comparison_window.resize(800, 600)
+
+    def display_results(self, data, store_on_chain=True):
         """Displays the analysis results with comparison visualization"""
         try:
             # Get existing DL model results
@@ -430,114 +720,81 @@ class MainWindow(QMainWindow , EthereumBlockchain):
             lat = data.get('latitude', self.current_latitude)
             lon = data.get('longitude', self.current_longitude)
             
-            # Store basic data in blockchain
-            if self.blockchain:
-                blockchain_result = self.blockchain.store_deforestation_alert(
-                    latitude=lat,
-                    longitude=lon,
-                    deforestation_score=deforestation_score
-                )
-                
-                if blockchain_result["status"] == "success":
-                    print(f"Alert stored in blockchain. Transaction hash: {blockchain_result['transaction_hash']}")
-                else:
-                    print(f"Blockchain storage: {blockchain_result['message']}")
-
-            # Create visualization window
-            self.comparison_window = QWidget()
-            layout = QVBoxLayout()
-            
-            # Add result labels
-            layout.addWidget(QLabel(f"Location: {lat:.6f}°, {lon:.6f}°"))
-            layout.addWidget(QLabel(f"Analysis Date: {date_time}"))
-            layout.addWidget(QLabel(f"Current Deforestation Score: {deforestation_score*100}%"))
-            
-            # Add blockchain transaction info if available
-            if self.blockchain and blockchain_result.get("status") == "success":
-                layout.addWidget(QLabel("Blockchain Transaction Info:"))
-                layout.addWidget(QLabel(f"Status: {'DEFORESTED' if deforestation_score > 0.4 else 'FOREST'}"))
-                layout.addWidget(QLabel(f"Transaction Hash: {blockchain_result['transaction_hash'][:20]}..."))
-                layout.addWidget(QLabel(f"Block Number: {blockchain_result['block_number']}"))
-
             # Rest of the visualization code...
             # Get historical data from com.py
             historical_data = get_deforestation_data(lat, lon)
             deforestation_score = deforestation_score * 100
 
-            # Store results in blockchain
-            if self.blockchain:
-                blockchain_result = self.blockchain.store_deforestation_alert(
-                    latitude=lat,
-                    longitude=lon,
-                    deforestation_score=deforestation_score/100  # Convert back to 0-1 scale
-                )
-                
-                if blockchain_result["status"] == "success":
-                    print(f"Alert stored in blockchain. Transaction hash: {blockchain_result['transaction_hash']}")
-                else:
-                    print(f"Blockchain storage: {blockchain_result['message']}")
-
-            # Create visualization window
-            self.comparison_window = QWidget()
-            layout = QVBoxLayout()
+            # Store results in blockchain through the durable outbox (once per analysis)
+            if store_on_chain:
+                blockchain_result = self.submit_alert(lat, lon, deforestation_score/100, timestamp)  # Convert back to 0-1 scale
+
+            # One comparison window is reused for every analysis
+            if self.comparison_window is None:
+                self.build_comparison_window()
+            
+            self.location_label.setText(f"Location: {lat:.6f}°, {lon:.6f}°")
+            self.date_label.setText(f"Analysis Date: {date_time}")
+            self.score_label.setText(f"Current Deforestation Score: {deforestation_score}%")
             
-            # Add result labels
-            layout.addWidget(QLabel(f"Location: {lat:.6f}°, {lon:.6f}°"))
-            layout.addWidget(QLabel(f"Analysis Date: {date_time}"))
-            layout.addWidget(QLabel(f"Current Deforestation Score: {deforestation_score}%"))
+            # Closest known forest, from the offline index
+            forest_index = self.get_forest_index()
+            nearest = forest_index.nearest(lat, lon) if forest_index is not None else None
+            if nearest is not None:
+                name, _, _, distance_km = nearest
+                self.nearest_forest_label.setText(f"Nearest Forest: {name} ({distance_km:.1f} km)")
+            else:
+                self.nearest_forest_label.setText("Nearest Forest: unknown (update forest data)")
             
-            # Add blockchain transaction info if available
-            if self.blockchain and blockchain_result.get("status") == "success":
-                layout.addWidget(QLabel("Blockchain Transaction Info:"))
-                layout.addWidget(QLabel(f"Transaction Hash: {blockchain_result['transaction_hash'][:20]}..."))
-                layout.addWidget(QLabel(f"Block Number: {blockchain_result['block_number']}"))
-
-            # Create matplotlib figure
-            fig = plt.figure(figsize=(10, 6))
-            ax = fig.add_subplot(111)
+            # Blockchain transaction info; filled in when the receipt arrives
+            queued = store_on_chain and blockchain_result.get("status") == "queued"
+            self.shown_alert_key = blockchain_result["key"] if queued else None
+            self.chain_type_label.setText(f"Blockchain Status: {'DEFORESTED' if deforestation_score > 40 else 'FOREST'}")
+            self.blockchain_status_label.setText("Transaction: submitting...")
+            for label in (self.chain_type_label, self.blockchain_status_label):
+                label.setVisible(queued)
+            self.show_alert_history(lat, lon)
             
-            # Plot historical data
+            # Update the chart in place
             years = [d['year'] for d in historical_data['historical_data']]
             historical_values = [d['deforestation_percent'] for d in historical_data['historical_data']]
-            ax.plot(years, historical_values, 'b-o', label='Historical Data')
-            
-            # Plot current DL prediction
-            current_year = datetime.now().year
-            ax.plot(current_year, deforestation_score, 'r*', markersize=15, label='Current DL Prediction')
-            
-            ax.set_title('Deforestation Analysis Comparison')
-            ax.set_xlabel('Year')
-            ax.set_ylabel('Deforestation Percentage (%)')
-            ax.grid(True)
-            ax.legend()
+            self.comparison_chart.update_chart(years, historical_values, datetime.now().year, deforestation_score)
             
-            # Create canvas widget
-            canvas = FigureCanvas(fig)
-            layout.addWidget(canvas)
-            
-            # Add to window
-            self.comparison_window.setLayout(layout)
-            self.comparison_window.setWindowTitle("Deforestation Analysis Comparison")
-            self.comparison_window.resize(800, 600)
             self.comparison_window.show()
+            self.comparison_window.raise_()
             
-            # Save results
-            result_file = f"analysis_result_{timestamp}.txt"
-            with open(result_file, 'w') as f:
-                f.write(f"Deforestation Analysis Results\n")
-                f.write(f"Date: {date_time}\n")
-                f.write(f"Location: {lat:.6f}°, {lon:.6f}°\n")
-                f.write(f"Classification: {classification}\n")
-                f.write(f"Current Deforestation Score: {deforestation_score:.2f}%\n")
-                f.write(f"Confidence: {confidence:.2%}\n")
-                f.write("\nHistorical Data:\n")
-                for d in historical_data['historical_data']:
-                    f.write(f"Year {d['year']}: {d['deforestation_percent']}%\n")
+            # Save results (written in the background by the results store)
+            self.results_store.record({
+                'timestamp': timestamp,
+                'latitude': lat,
+                'longitude': lon,
+                'deforestation_score': data.get('deforestation_score', 0),
+                'classification': data.get('classification'),
+                'confidence': data.get('confidence'),
+                'historical_data': historical_data['historical_data']
+            })
         
         except Exception as e:
             print(f"Error in display_results: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to display results: {str(e)}")
     
+    def show_alert_history(self, lat, lon):
+        """Earlier on-chain alerts near the point, read from the local mirror, never the node"""
+        if self.alert_mirror is None:
+            self.alert_history_label.setVisible(False)
+            return
+        bbox = (lat - ALERT_HISTORY_RADIUS, lon - ALERT_HISTORY_RADIUS,
+                lat + ALERT_HISTORY_RADIUS, lon + ALERT_HISTORY_RADIUS)
+        alerts = self.alert_mirror.query(bbox=bbox)
+        if alerts:
+            latest = time.strftime("%Y-%m-%d", time.localtime(alerts[0]["timestamp"]))
+            text = (f"On-chain alerts nearby: {len(alerts)} of {self.alert_mirror.count()} "
+                    f"(latest {latest})")
+        else:
+            text = f"On-chain alerts nearby: none of {self.alert_mirror.count()}"
+        self.alert_history_label.setText(text)
+        self.alert_history_label.setVisible(True)
+
     def plot_coordinates(self, lat, lon, score=None):
         """Plot the coordinates on the map with a pin"""
         # Create label text based on score if available
@@ -572,12 +829,13 @@ class MainWindow(QMainWindow , EthereumBlockchain):
     def open_poaching_window(self):
         """Open the poaching detection window from 1.py"""
         try:
+            from deforest1 import ForestMonitoringApp
             self.hide()  # Hide the current window
             self.poaching_window = ForestMonitoringApp()
             self.poaching_window.show()
             
-            # Connect the close event to show the main window again
-            self.poaching_window.closeEvent = lambda event: self.show()
+            # Show the main window again once the poaching window has shut down
+            self.poaching_window.closed.connect(self.show)
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to open poaching detection: {str(e)}")
@@ -590,9 +848,6 @@ class MainWindow(QMainWindow , EthereumBlockchain):
             self.progress_bar.setVisible(True)
             self.plot_forests_button.setEnabled(False)
 
-            # Process all coordinates into points
-            forest_dict = {'points': []}
-            
             # Extended coordinates array with 100+ forest locations
             coordinates_array = [
                 [93.039985657, 12.126609802], [93.037185669, 12.133360863],
@@ -652,61 +907,19 @@ class MainWindow(QMainWindow , EthereumBlockchain):
                 [78.486671, 17.385044], [78.315239, 17.412725],  # Central forests
             ]
 
-            # Convert all coordinates to points
-            for i, coord in enumerate(coordinates_array):
-                forest_dict['points'].append({
-                    'lon': coord[0],
-                    'lat': coord[1],
-                    'name': f'Forest Area {i+1}'
-                })
-
-            # Rest of the plotting code remains the same
-            js_points = []
-            for point in forest_dict['points']:
-                js_point = f"{{lat: {point['lat']}, lon: {point['lon']}, name: '{point['name']}'}}"
-                js_points.append(js_point)
-
-            if js_points:
-                # First zoom out to show all of India
-                self.browser.page().runJavaScript("""
-                zoomToLocation(22.3511148, 78.6677428, 3000000);
-                """)
+            # First zoom out to show all of India
+            self.browser.page().runJavaScript("""
+            zoomToLocation(22.3511148, 78.6677428, 3000000);
+            """)
 
-                
+            # Add forests from the offline index inside India (stored as lat, lon)
+            coordinates = np.asarray(coordinates_array, dtype=np.float64)
+            forest_index = self.get_forest_index()
+            if forest_index is not None:
+                indexed = forest_index.within_bbox(*INDIA_BBOX)
+                coordinates = np.concatenate([coordinates, indexed[:, ::-1]])
 
-                # Plot all points in batch
-                points_array = "[" + ",".join(js_points) + "]"
-                js_command = f"""
-                (function() {{
-                    const points = {points_array};
-                    for (const point of points) {{
-                        viewer.entities.add({{
-                            position: Cesium.Cartesian3.fromDegrees(point.lon, point.lat),
-                            point: {{
-                                pixelSize: 5,
-                                color: Cesium.Color.GREEN.withAlpha(0.8),
-                                outlineColor: Cesium.Color.WHITE,
-                                outlineWidth: 1
-                            }},
-                            label: {{
-                                text: point.name,
-                                font: '10px sans-serif',
-                                fillColor: Cesium.Color.WHITE,
-                                style: Cesium.LabelStyle.FILL_AND_OUTLINE,
-                                outlineWidth: 1,
-                                verticalOrigin: Cesium.VerticalOrigin.BOTTOM,
-                                pixelOffset: new Cesium.Cartesian2(0, -6),
-                                show: false
-                            }}
-                        }});
-                    }}
-                    return points.length;
-                }})();
-                """
-                
-                self.browser.page().runJavaScript(js_command, self.handle_forest_plotting_complete)
-
-            # ...existing code...
+            self.load_forest_points(coordinates)
 
         except Exception as e:
             self.progress_bar.setVisible(False)
@@ -715,6 +928,63 @@ class MainWindow(QMainWindow , EthereumBlockchain):
             QMessageBox.critical(self, "Plotting Error", f"Failed to plot forests: {str(e)}")
             self.status_label.setText("Plot failed")
 
+    def load_forest_points(self, coordinates):
+        """Dedupe (lon, lat) pairs and send them to the page as one packed Float32Array"""
+        points = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+        # ~1 m precision is plenty to spot duplicate forest nodes
+        points = np.unique(np.round(points, 5), axis=0)
+        self.forest_points = points
+
+        encoded = base64.b64encode(points.astype('<f4').tobytes()).decode('ascii')
+        self.browser.page().runJavaScript(f"loadForestPoints('{encoded}');",
+                                          self.handle_forest_plotting_complete)
+
+    def get_forest_index(self):
+        """The offline forest index, opened on first use; None while a refresh is rewriting it"""
+        if self.forest_refreshing:
+            return None
+        if self.forest_index is None:
+            from forest2 import ForestIndex
+            self.forest_index = ForestIndex()
+        return self.forest_index
+
+    def refresh_forest_index(self):
+        """Fetch new and changed forests from Overpass in the background"""
+        if self.forest_refreshing:
+            return
+        self.forest_refreshing = True
+        # Drop our memory maps so the refresh can replace the index files
+        self.forest_index = None
+        self.refresh_forests_button.setEnabled(False)
+        self.plot_forests_button.setEnabled(False)
+        self.status_label.setText("Updating forest data...")
+        threading.Thread(target=self.refresh_forest_index_worker, daemon=True,
+                         name="forest-refresh").start()
+
+    def refresh_forest_index_worker(self):
+        from forest2 import ForestIndex
+        index = ForestIndex()
+        try:
+            changed = index.refresh()
+        except Exception as e:
+            print(f"Error refreshing forest index: {str(e)}")
+            changed = None
+        self.forest_index_refreshed.emit(index, changed)
+
+    def handle_forest_index_refreshed(self, index, changed):
+        """Called on the GUI thread when a forest index refresh finishes"""
+        self.forest_index = index
+        self.forest_refreshing = False
+        self.refresh_forests_button.setEnabled(True)
+        self.plot_forests_button.setEnabled(self.map_loaded)
+        if changed is None:
+            self.status_label.setText("Forest data update failed; using the offline index")
+            return
+        self.status_label.setText(f"Forest data updated: {changed} new or changed ({len(index)} total)")
+        if changed and self.map_loaded:
+            self.plot_indian_forests()
+
     def handle_forest_plotting_complete(self, count):
         """Handle completion of forest plotting"""
         self.progress_bar.setVisible(False)
@@ -842,6 +1112,7 @@ class PoachingDetectionWindow(QWidget):
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
-    window = MainWindow()
+    with startup_timer.measure("service", "main window"):
+        window = MainWindow()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file